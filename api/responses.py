@@ -0,0 +1,15 @@
+"""Response classes shared by the app and its routers."""
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response encoded with orjson, for endpoints that return plain dicts.
+
+    Routes with a pydantic response_model keep FastAPI's default response
+    class so they stay on its pydantic serialization path.
+    """
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
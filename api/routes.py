@@ -1,28 +1,38 @@
 """API routes for the Ad Creative Agent tools."""
 
-from fastapi import APIRouter, HTTPException
+import asyncio
+import copy
+from functools import lru_cache
+from typing import Annotated, Literal
 
+import orjson
+from fastapi import APIRouter, File, Form, HTTPException, Request, Response, UploadFile
+from fastapi.responses import StreamingResponse
+from pydantic import BeforeValidator, Field, TypeAdapter, ValidationError, WithJsonSchema
+
+from api.responses import ORJSONResponse
 from api.schemas import (
     ImageGenerationRequest,
     ImageGenerationResponse,
-    GeneratedImage,
     ReferenceAnalysisRequest,
     ReferenceAnalysisResponse,
-    ColorInfo,
     VideoGenerationRequest,
     VideoGenerationResponse,
+    VideoJobResponse,
     WebSearchRequest,
     WebSearchResponse,
-    SearchResult,
     HealthResponse,
+    VariationIn,
 )
 from config import get_settings
 from tools.image_gen import generate_image, compare_backends
 from tools.reference import analyze_reference, search_references
-from tools.video_gen import generate_video
-from services.image_compositor import ImageCompositor
+from tools.video_gen import generate_video, start_video_job, get_video_job
+from services.http_client import get_http_client
+from services.image_compositor import get_image_compositor
+from services.storage import get_storage_service
 from services.modern_compositor import (
-    ModernCompositor,
+    get_modern_compositor,
     DesignPreset,
     TextPosition,
     get_available_fonts,
@@ -34,6 +44,65 @@ from services.modern_compositor import (
 router = APIRouter()
 
 
+# Map font_style (Dify dropdown value) to font_name
+STYLE_TO_FONT = {"bold": "impact", "clean": "liberation", "modern": "arial_bold"}
+
+
+@lru_cache(maxsize=256)
+def _normalize_style(
+    text_color: str,
+    font_style: str,
+    font_name: str = "impact",
+) -> tuple[str, str, str]:
+    """
+    Turn the free-form Dify color/style strings into compositor arguments.
+
+    Returns (text_color, outline_color, font_name).
+    Agents resend the same handful of values, so results are cached.
+    """
+    # Default: white text with black outline (for dark/AI backgrounds)
+    # Black option: black text with white outline (for light/white backgrounds)
+    if text_color and "black" in text_color.lower():
+        actual_text_color, outline_color = "black", "white"
+    else:
+        actual_text_color, outline_color = "white", "black"
+
+    if font_style:
+        font_name = STYLE_TO_FONT.get(font_style.lower().replace(" (default)", ""), font_name)
+
+    return actual_text_color, outline_color, font_name
+
+
+def _parse_yes(value) -> bool:
+    """Dify select values ("Yes"/"No") or plain booleans -> bool."""
+    if isinstance(value, str):
+        value = value.strip().lower()
+        return "yes" in value or value in ("true", "1", "on")
+    return bool(value)
+
+
+def _parse_yes_default_on(value) -> bool:
+    """Like _parse_yes, but an empty value means yes."""
+    return value == "" or _parse_yes(value)
+
+
+# Yes/No toggles parsed during request validation. The OpenAPI schema stays a
+# string with the original string defaults, so Dify tool configs are unchanged;
+# validate_default runs the parser on those defaults too.
+YesFlag = Annotated[
+    bool,
+    BeforeValidator(_parse_yes),
+    WithJsonSchema({"type": "string"}),
+    Field(validate_default=True),
+]
+YesFlagDefaultOn = Annotated[
+    bool,
+    BeforeValidator(_parse_yes_default_on),
+    WithJsonSchema({"type": "string"}),
+    Field(validate_default=True),
+]
+
+
 # ===================
 # Health Check
 # ===================
@@ -77,15 +146,8 @@ async def api_generate_image(request: ImageGenerationRequest):
 
     return ImageGenerationResponse(
         success=result["success"],
-        images=[
-            GeneratedImage(
-                url=img["url"],
-                filename=img["filename"],
-                backend=img["backend"],
-                revised_prompt=img.get("revised_prompt"),
-            )
-            for img in result.get("images", [])
-        ],
+        # Tool dicts already match the schemas; pydantic validates them in one pass
+        images=result.get("images", []),
         error=result.get("error"),
         metadata=result.get("metadata", {}),
     )
@@ -93,6 +155,7 @@ async def api_generate_image(request: ImageGenerationRequest):
 
 @router.post(
     "/tools/compare-backends",
+    response_class=ORJSONResponse,
     response_model=dict,
     tags=["Image Generation"],
     summary="Compare image generation backends",
@@ -121,6 +184,7 @@ async def api_compare_backends(
 @router.post(
     "/tools/analyze-reference",
     response_model=ReferenceAnalysisResponse,
+    response_model_exclude_none=True,
     tags=["Reference"],
     summary="Analyze a reference image (Technical)",
     description="Analyze a reference image to extract TECHNICAL data: dominant colors (hex), dimensions, format. "
@@ -129,12 +193,34 @@ async def api_compare_backends(
 async def api_analyze_reference(request: ReferenceAnalysisRequest):
     """Analyze a reference image."""
     result = await analyze_reference(
-        image_url=str(request.image_url) if request.image_url else None,
+        image_url=request.image_url,
         image_base64=request.image_base64,
         analysis_type=request.analysis_type,
         context=request.context,
     )
+    return _reference_response(result)
+
 
+@router.post(
+    "/tools/analyze-reference-upload",
+    response_model=ReferenceAnalysisResponse,
+    response_model_exclude_none=True,
+    tags=["Reference"],
+    summary="Analyze an uploaded reference image (Technical)",
+    description="Same as /tools/analyze-reference, but takes the image as a multipart file upload "
+    "instead of a URL or base64 string.",
+)
+async def api_analyze_reference_upload(
+    image: UploadFile = File(..., description="Reference image file"),
+    analysis_type: str = Form(default="technical"),
+):
+    """Analyze an uploaded reference image without base64-encoding it."""
+    result = await analyze_reference(image_file=image.file, analysis_type=analysis_type)
+    return _reference_response(result)
+
+
+def _reference_response(result: dict) -> ReferenceAnalysisResponse:
+    """Build the API response from an analyze_reference result."""
     if not result.get("success"):
         return ReferenceAnalysisResponse(
             success=False,
@@ -145,17 +231,11 @@ async def api_analyze_reference(request: ReferenceAnalysisRequest):
         success=True,
         # Style description is now handled by Dify, but we return a technical summary
         style_description=result.get("dify_context", "Analysis complete"),
-        dominant_colors=[
-            ColorInfo(
-                hex=c.get("hex", "#000000"),
-                name="Color", # Name extraction removed to avoid complexity
-                percentage=c.get("percentage", 0.0),
-            )
-            for c in result.get("dominant_colors", [])
-        ],
+        # Name extraction removed to avoid complexity
+        dominant_colors=[{**c, "name": "Color"} for c in result.get("dominant_colors", [])],
         composition_notes=f"{result.get('width')}x{result.get('height')} px",
         text_detected=False, # Removed OCR
-        mood="Neutral", # Removed mood analysis
+        # mood left unset: mood analysis moved to Dify
         suggested_prompt_elements=[], # Removed prompt suggestion
     )
 
@@ -178,16 +258,7 @@ async def api_search_references(request: WebSearchRequest):
 
     return WebSearchResponse(
         success=result.get("success", False),
-        results=[
-            SearchResult(
-                title=r.get("title", ""),
-                url=r.get("url", ""),
-                image_url=r.get("image_url"),
-                thumbnail_url=r.get("thumbnail_url"),
-                source=r.get("source"),
-            )
-            for r in result.get("results", [])
-        ],
+        results=result.get("results", []),
         error=result.get("error"),
     )
 
@@ -225,12 +296,66 @@ async def api_generate_video(request: VideoGenerationRequest):
     )
 
 
+@router.post(
+    "/tools/generate-video/async",
+    response_model=VideoJobResponse,
+    tags=["Video Generation"],
+    summary="Start video generation in the background",
+    description="Starts a video job and returns a task_id immediately. "
+    "Poll /tools/generate-video/status/{task_id} for the result. "
+    "Jobs are held in the memory of the worker process that started them, so "
+    "this endpoint requires a single-worker deployment (WORKERS=1): with more "
+    "workers a status poll can land on a process that doesn't know the task_id.",
+)
+async def api_generate_video_async(request: VideoGenerationRequest):
+    """Start a video job without holding the request open for the render."""
+    task_id = start_video_job(
+        prompt=request.prompt,
+        source_image_url=request.source_image_url,
+        backend=request.backend,
+        duration=request.duration,
+        aspect_ratio=request.aspect_ratio,
+    )
+    return VideoJobResponse(task_id=task_id, status="pending")
+
+
+@router.get(
+    "/tools/generate-video/status/{task_id}",
+    response_model=VideoJobResponse,
+    tags=["Video Generation"],
+    summary="Get background video job status",
+    description="Returns the job state and, once finished, the generation result. "
+    "Only the worker process that started a job knows it; run with WORKERS=1 "
+    "when using background video jobs.",
+)
+async def api_generate_video_status(task_id: str):
+    """Poll a background video job."""
+    job = get_video_job(task_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown task_id '{task_id}'")
+
+    result = job["result"]
+    return VideoJobResponse(
+        task_id=task_id,
+        status=job["status"],
+        result=VideoGenerationResponse(
+            success=result.get("success", False),
+            video_url=result.get("video_url"),
+            thumbnail_url=result.get("thumbnail_url"),
+            duration=result.get("duration"),
+            backend=result.get("backend"),
+            error=result.get("error"),
+        ) if result is not None else None,
+    )
+
+
 # ===================
 # Image Compositor
 # ===================
 
 @router.post(
     "/tools/compose-ad",
+    response_class=ORJSONResponse,
     tags=["Compositing"],
     summary="Compose final ad with text overlay",
     description="Add text overlay to generated image using Pillow. Fully automated.",
@@ -247,31 +372,14 @@ async def api_compose_ad(
     body_font_size: int = 60,
     cta_font_size: int = 48,
     text_color: str = "",
-    cta_emoji: str = "",
-    bold_hook: str = "",
+    cta_emoji: YesFlag = "",
+    bold_hook: YesFlagDefaultOn = "",
+    output_format: Literal["png", "jpeg", "webp"] = "png",
 ):
     """Compose final ad with text overlay."""
-    # Determine text and outline colors
-    # Default: white text with black outline (for dark/AI backgrounds)
-    # Black option: black text with white outline (for light/white backgrounds)
-    if text_color and "black" in text_color.lower():
-        actual_text_color = "black"
-        outline_color = "white"
-    else:
-        actual_text_color = "white"
-        outline_color = "black"
+    actual_text_color, outline_color, font_name = _normalize_style(text_color, font_style, font_name)
 
-    # Parse boolean toggles from string
-    use_cta_emoji = cta_emoji and "yes" in cta_emoji.lower()
-    use_bold_hook = not bold_hook or "yes" in bold_hook.lower()  # Default to yes
-
-    # Map font_style to font_name
-    style_to_font = {"bold": "impact", "clean": "liberation", "modern": "arial_bold"}
-    if font_style:
-        font_style_lower = font_style.lower().replace(" (default)", "")
-        font_name = style_to_font.get(font_style_lower, font_name)
-
-    compositor = ImageCompositor()
+    compositor = get_image_compositor()
     return await compositor.compose(
         image_source=image_url,
         hook_text=hook_text,
@@ -284,13 +392,15 @@ async def api_compose_ad(
         cta_font_size=cta_font_size,
         text_color=actual_text_color,
         outline_color=outline_color,
-        cta_emoji=use_cta_emoji,
-        bold_hook=use_bold_hook,
+        cta_emoji=cta_emoji,
+        bold_hook=bold_hook,
+        output_format=output_format,
     )
 
 
 @router.post(
     "/tools/compose-format",
+    response_class=ORJSONResponse,
     tags=["Compositing"],
     summary="Compose ad with selectable format",
     description="""Unified composition endpoint supporting 4 visual formats:
@@ -314,7 +424,7 @@ async def api_compose_format(
     cta_style: str = "text",
     cta_button_color: str = "auto",
     safe_zone: str = "auto",
-    bold_hook: str = "yes",
+    bold_hook: YesFlagDefaultOn = "yes",
 ):
     """
     Compose an ad image with the selected format type.
@@ -336,19 +446,15 @@ async def api_compose_format(
     - instagram_story: Instagram Story margins
     - none: Minimal padding only
     """
-    import json
-
     # Parse sticker URLs
     sticker_list = []
     if sticker_urls:
         try:
-            sticker_list = json.loads(sticker_urls)
-        except json.JSONDecodeError:
+            sticker_list = orjson.loads(sticker_urls)
+        except orjson.JSONDecodeError:
             sticker_list = [s.strip() for s in sticker_urls.split(",") if s.strip()]
 
-    use_bold_hook = not bold_hook or "yes" in bold_hook.lower()
-
-    compositor = ImageCompositor()
+    compositor = get_image_compositor()
     return await compositor.compose_format(
         format_type=format_type,
         hook_text=hook_text,
@@ -363,12 +469,17 @@ async def api_compose_format(
         cta_style=cta_style,
         cta_button_color=cta_button_color,
         safe_zone=safe_zone,
-        bold_hook=use_bold_hook,
+        bold_hook=bold_hook,
     )
 
 
+# Built once: parses, validates and dumps variations_json in pydantic-core
+_variations_adapter = TypeAdapter(list[VariationIn])
+
+
 @router.post(
     "/tools/compose-batch",
+    response_class=ORJSONResponse,
     tags=["Compositing"],
     summary="Compose multiple ads from variations",
     description="Generate multiple ad creatives from a JSON array of copy variations. Supports all 4 format types.",
@@ -378,73 +489,94 @@ async def api_compose_batch(
     variations_json: str = "",  # JSON array: [{"hook": "...", "body": "...", "cta": "..."}, ...]
     output_size: str = "instagram_square",
     text_color: str = "",
-    cta_emoji: str = "",
-    bold_hook: str = "",
+    cta_emoji: YesFlag = "",
+    bold_hook: YesFlagDefaultOn = "",
     format_type: str = "meme",
     cta_style: str = "text",
     right_bg_color: str = "white",
     safe_zone: str = "auto",
+    stream: bool = False,
 ):
-    """Compose multiple ads from variations array with format support."""
-    import json
+    """
+    Compose multiple ads from variations array with format support.
 
-    # Parse variations
+    With stream=true the response is NDJSON: one line per variation as soon
+    as it finishes, in completion order. "index" is the variation's 1-based
+    position in variations_json, and failed variations carry "error".
+    """
+    # Parse and validate variations straight from the JSON string
     try:
-        variations = json.loads(variations_json) if variations_json else []
-        if not isinstance(variations, list):
+        variations = _variations_adapter.dump_python(
+            _variations_adapter.validate_json(variations_json or "[]")
+        )
+    except ValidationError as e:
+        first = e.errors()[0]
+        if first["type"] == "json_invalid":
+            return {"success": False, "error": f"Invalid JSON: {first['ctx']['error']}"}
+        if first["type"] == "list_type" and not first["loc"]:
             return {"success": False, "error": "variations_json must be a JSON array"}
-    except json.JSONDecodeError as e:
-        return {"success": False, "error": f"Invalid JSON: {str(e)}"}
+        return {"success": False, "error": f"Invalid variations: {str(e)}"}
 
-    # Determine colors
-    if text_color and "black" in text_color.lower():
-        actual_text_color = "black"
-    else:
-        actual_text_color = "white"
+    actual_text_color, _, _ = _normalize_style(text_color, "")
 
-    use_bold_hook = not bold_hook or "yes" in bold_hook.lower()
+    compositor = get_image_compositor()
 
-    compositor = ImageCompositor()
-    results = []
+    # Fetch and decode the background once for the whole batch
+    base_image = None
+    uses_image = format_type in ("meme", "split")
+    if uses_image and image_url and image_url.lower() not in ("white", "blank", "none"):
+        try:
+            base_image = await compositor._load_image(image_url)
+        except Exception as e:
+            return {"success": False, "error": f"Failed to load image: {str(e)}"}
 
-    # Process each variation using compose_format for full format support
-    for v in variations:
-        result = await compositor.compose_format(
-            format_type=format_type,
-            hook_text=v.get("hook", v.get("hook_text", "")),
-            body_text=v.get("body", v.get("body_text", "")),
-            cta_text=v.get("cta", v.get("cta_text", "")),
-            image_url=image_url,
-            output_size=output_size,
-            text_color=actual_text_color,
-            right_bg_color=right_bg_color,
-            cta_style=cta_style,
-            safe_zone=safe_zone,
-            bold_hook=use_bold_hook,
-        )
-        if result.get("success"):
-            results.append(result["url"])
+    compose_kwargs = dict(
+        format_type=format_type,
+        image_url=image_url,
+        output_size=output_size,
+        text_color=actual_text_color,
+        right_bg_color=right_bg_color,
+        cta_style=cta_style,
+        safe_zone=safe_zone,
+        bold_hook=bold_hook,
+    )
 
-    result_urls = results
+    if stream:
+        async def ndjson_lines():
+            async for i, result in compositor.iter_batch_compose_format(
+                base_image, variations, **compose_kwargs
+            ):
+                line = {"index": i + 1, "success": bool(result.get("success"))}
+                if line["success"]:
+                    line.update(url=result["url"], **variations[i])
+                else:
+                    line["error"] = result.get("error")
+                yield orjson.dumps(line) + b"\n"
 
-    if not result_urls:
-        return {
-            "success": False,
-            "error": "Batch composition failed or produced no results",
-        }
+        return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+    # Process all variations using compose_format for full format support
+    batch_results = await compositor.batch_compose_format(base_image, variations, **compose_kwargs)
 
     # Format response to include metadata for each
     results = []
-    for i, url in enumerate(result_urls):
-        orig_var = variations[i] if i < len(variations) else {}
+    for orig_var, result in zip(variations, batch_results):
+        if not result.get("success"):
+            continue
         results.append({
-            "index": i + 1,
-            "url": url,
+            "index": len(results) + 1,
+            "url": result["url"],
             "hook": orig_var.get("hook", ""),
             "body": orig_var.get("body", ""),
             "cta": orig_var.get("cta", ""),
         })
 
+    if not results:
+        return {
+            "success": False,
+            "error": "Batch composition failed or produced no results",
+        }
+
     return {
         "success": True,
         "count": len(results),
@@ -459,6 +591,7 @@ async def api_compose_batch(
 
 @router.post(
     "/tools/compose-modern",
+    response_class=ORJSONResponse,
     tags=["Compositing"],
     summary="Compose ad with modern text effects",
     description="""Create professional ad creatives with modern text effects using pictex.
@@ -486,6 +619,7 @@ anton, russo_one, jost, manrope, bebas_neue, fira_sans, source_sans, ibm_plex, e
 """,
 )
 async def api_compose_modern(
+    request: Request,
     hook_text: str,
     body_text: str = "",
     cta_text: str = "Подробнее →",
@@ -494,6 +628,7 @@ async def api_compose_modern(
     background_image_url: str = "",
     font_name: str = "inter",
     text_position: str = "center",
+    return_binary: bool = False,
 ):
     """
     Compose an ad with modern text effects.
@@ -507,10 +642,9 @@ async def api_compose_modern(
         background_image_url: Optional background image URL (will darken and overlay text)
         font_name: Font to use (default: inter). See /tools/fonts for full list.
         text_position: Text positioning (center, top_heavy, bottom_heavy)
+        return_binary: Return the image itself instead of uploading it and
+            returning a URL (WebP if the client accepts it, else PNG)
     """
-    import httpx
-    from services.storage import get_storage_service
-
     try:
         # Validate preset
         try:
@@ -531,7 +665,12 @@ async def api_compose_modern(
         if font_name not in FONTS:
             font_name = "inter"  # Default fallback
 
-        compositor = ModernCompositor()
+        compositor = get_modern_compositor()
+
+        # Binary responses are encoded once, as WebP if the client accepts it
+        output_format = "png"
+        if return_binary and "image/webp" in request.headers.get("accept", ""):
+            output_format = "webp"
 
         # Choose composition method based on background image
         # Skip if empty, "white", or not a valid URL
@@ -548,11 +687,13 @@ async def api_compose_modern(
                 download_url = background_image_url.replace(
                     "https://creo.yourads.io", "http://localhost:8000"
                 )
-            async with httpx.AsyncClient() as client:
-                response = await client.get(download_url, timeout=60, follow_redirects=True)
-                bg_image_bytes = response.content
+            client = get_http_client()
+            response = await client.get(download_url, timeout=60, follow_redirects=True)
+            bg_image_bytes = response.content
 
-            image_bytes = compositor.compose_with_image_overlay(
+            # Rendering and PNG encoding are CPU-bound; keep them off the event loop
+            image_bytes = await asyncio.to_thread(
+                compositor.compose_with_image_overlay,
                 hook_text=hook_text,
                 body_text=body_text,
                 cta_text=cta_text,
@@ -562,9 +703,11 @@ async def api_compose_modern(
                 darken=0.5,
                 font_name=font_name,
                 text_position=position,
+                output_format=output_format,
             )
         else:
-            image_bytes = compositor.compose(
+            image_bytes = await asyncio.to_thread(
+                compositor.compose,
                 hook_text=hook_text,
                 body_text=body_text,
                 cta_text=cta_text,
@@ -572,6 +715,16 @@ async def api_compose_modern(
                 output_size=output_size,
                 font_name=font_name,
                 text_position=position,
+                output_format=output_format,
+            )
+
+        if return_binary:
+            # Skip the storage write and the client's second round-trip.
+            # The body depends on Accept, so shared caches must key on it
+            return Response(
+                content=image_bytes,
+                media_type=f"image/{output_format}",
+                headers={"X-Preset": preset, "X-Output-Size": output_size, "Vary": "Accept"},
             )
 
         # Upload to storage
@@ -606,15 +759,28 @@ async def api_compose_modern(
     summary="Get OpenAPI schema for Dify",
     description="Returns the OpenAPI schema in a format suitable for Dify tool import.",
 )
-async def get_openapi_for_dify():
+async def get_openapi_for_dify(request: Request):
     """
     Get OpenAPI schema formatted for Dify import.
     Converts OpenAPI 3.1.0 to 3.0.0 for Dify compatibility.
+
+    The routes are fixed once the app is built, so the converted schema is
+    serialized on the first call and the same bytes are served afterwards.
     """
-    import copy
-    from main import app
+    global _dify_openapi_body
+    if _dify_openapi_body is None:
+        schema = _build_dify_openapi(request.app.openapi())
+        _dify_openapi_body = orjson.dumps(schema)
+    return Response(content=_dify_openapi_body, media_type="application/json")
+
+
+# Serialized Dify schema, built on first request to /tools/openapi.json
+_dify_openapi_body: bytes | None = None
+
 
-    schema = copy.deepcopy(app.openapi())
+def _build_dify_openapi(openapi_schema: dict) -> dict:
+    """Convert the app's OpenAPI 3.1.0 schema into a 3.0.0 copy Dify can import."""
+    schema = copy.deepcopy(openapi_schema)
 
     # Downgrade to 3.0.0 for Dify compatibility
     schema["openapi"] = "3.0.0"
@@ -658,6 +824,7 @@ async def get_openapi_for_dify():
 
 @router.get(
     "/tools/fonts",
+    response_class=ORJSONResponse,
     tags=["Typography"],
     summary="Get available fonts",
     description="Returns all available fonts with Cyrillic support info.",
@@ -682,6 +849,7 @@ async def api_get_fonts():
 
 @router.get(
     "/tools/sizes",
+    response_class=ORJSONResponse,
     tags=["Typography"],
     summary="Get available output sizes",
     description="Returns all available output size presets with dimensions.",
@@ -706,6 +874,7 @@ async def api_get_sizes():
 
 @router.get(
     "/tools/safe-zones",
+    response_class=ORJSONResponse,
     tags=["Typography"],
     summary="Get safe zones for all formats",
     description="Returns safe zone margins (in pixels) for each output format.",
@@ -1,8 +1,8 @@
 """Pydantic schemas for API request/response models."""
 
-from typing import Literal
+from typing import Annotated, Literal
 
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import AliasChoices, BaseModel, BeforeValidator, Field
 
 
 # ===================
@@ -81,8 +81,10 @@ class ImageGenerationResponse(BaseModel):
 class ReferenceAnalysisRequest(BaseModel):
     """Request model for reference image analysis."""
 
-    image_url: HttpUrl | None = Field(
-        default=None, description="URL of the reference image to analyze"
+    image_url: str | None = Field(
+        default=None,
+        pattern=r"^https?://",
+        description="URL of the reference image to analyze",
     )
     image_base64: str | None = Field(
         default=None, description="Base64-encoded image data"
@@ -121,7 +123,7 @@ class ReferenceAnalysisResponse(BaseModel):
     text_detected: bool | None = Field(
         default=False, description="Whether text was detected (always false in technical mode)"
     )
-    mood: str | None = Field(default=None, description="Overall mood (always Neutral in technical mode)")
+    mood: str | None = Field(default=None, description="Overall mood (omitted in technical mode)")
     suggested_prompt_elements: list[str] = Field(
         default_factory=list,
         description="Empty list (Creative suggestions moved to Dify)",
@@ -163,6 +165,18 @@ class VideoGenerationResponse(BaseModel):
     error: str | None = Field(default=None, description="Error message if failed")
 
 
+class VideoJobResponse(BaseModel):
+    """Status of a background video generation job."""
+
+    task_id: str = Field(..., description="Job id to poll for the result")
+    status: Literal["pending", "running", "done", "failed"] = Field(
+        ..., description="Current job state"
+    )
+    result: VideoGenerationResponse | None = Field(
+        default=None, description="Generation result once the job has finished"
+    )
+
+
 # ===================
 # Web Search (for references)
 # ===================
@@ -230,6 +244,28 @@ class TextVariation(BaseModel):
     cta_text: str | None = Field(default="", description="Call to action text")
 
 
+# Variation text where an explicit null means "no text", as a missing key does
+VariationText = Annotated[str, BeforeValidator(lambda v: "" if v is None else v)]
+
+
+class VariationIn(BaseModel):
+    """One entry of the compose-batch variations_json array.
+
+    Accepts both the short keys Dify sends (hook/body/cta) and the
+    hook_text/body_text/cta_text spelling.
+    """
+
+    hook: VariationText = Field(
+        default="", validation_alias=AliasChoices("hook", "hook_text"), description="Hook text"
+    )
+    body: VariationText = Field(
+        default="", validation_alias=AliasChoices("body", "body_text"), description="Body text"
+    )
+    cta: VariationText = Field(
+        default="", validation_alias=AliasChoices("cta", "cta_text"), description="Call to action text"
+    )
+
+
 class BatchComposeRequest(BaseModel):
     """Request model for batch ad composition."""
 
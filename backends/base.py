@@ -1,21 +1,33 @@
 """Abstract base class for image generation backends."""
 
 from abc import ABC, abstractmethod
+from bisect import bisect_left
 from dataclasses import dataclass, field
+from typing import BinaryIO
 
 
-@dataclass
+@dataclass(slots=True)
 class GenerationResult:
     """Result of an image generation request."""
 
     success: bool
-    image_data: bytes | None = None  # Raw image bytes
+    image_data: bytes | BinaryIO | None = None  # Raw image bytes or a rewound file of them
     image_url: str | None = None  # URL if backend returns URL directly
     revised_prompt: str | None = None  # Prompt as modified by the backend
     error: str | None = None
     metadata: dict = field(default_factory=dict)
 
 
+def closest_aspect_ratio(keys: tuple[float, ...], labels: tuple[str, ...], ratio: float) -> str:
+    """Return the label whose ratio is nearest, given keys sorted ascending."""
+    i = bisect_left(keys, ratio)
+    if i == 0:
+        return labels[0]
+    if i == len(keys):
+        return labels[-1]
+    return labels[i] if keys[i] - ratio < ratio - keys[i - 1] else labels[i - 1]
+
+
 class ImageBackend(ABC):
     """Abstract base class for image generation backends."""
 
@@ -34,9 +46,16 @@ class ImageBackend(ABC):
     default_size: str = "1024x1024"
     supported_sizes: list[str] = ["1024x1024"]
 
+    # supported_sizes parsed to (width, height), rebuilt per subclass
+    _size_dims: dict[str, tuple[int, int]] = {"1024x1024": (1024, 1024)}
+
     # Quality options
     supported_qualities: list[str] = ["standard"]
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._size_dims = {s: tuple(map(int, s.split("x"))) for s in cls.supported_sizes}
+
     @abstractmethod
     async def generate(
         self,
@@ -65,7 +84,7 @@ class ImageBackend(ABC):
 
     def validate_size(self, size: str) -> str:
         """Validate and normalize size, returning closest supported size."""
-        if size in self.supported_sizes:
+        if size in self._size_dims:
             return size
         # Return default if not supported
         return self.default_size
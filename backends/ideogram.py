@@ -1,9 +1,32 @@
 """Ideogram image generation backend."""
 
-import httpx
+from functools import lru_cache
 
-from backends.base import ImageBackend, GenerationResult
+import orjson
+
+from backends.base import ImageBackend, GenerationResult, closest_aspect_ratio
 from config import get_settings
+from services.http_client import download_to_spool, get_http_client
+
+
+# Supported aspect ratios (width / height), split into sorted keys for bisect
+_ASPECT_RATIOS = {
+    1.0: "ASPECT_1_1",
+    1.33: "ASPECT_4_3",
+    0.75: "ASPECT_3_4",
+    1.78: "ASPECT_16_9",
+    0.56: "ASPECT_9_16",
+    2.35: "ASPECT_21_9",
+    0.43: "ASPECT_9_21",
+    1.5: "ASPECT_3_2",
+    0.67: "ASPECT_2_3",
+}
+_ASPECT_RATIO_KEYS, _ASPECT_RATIO_LABELS = zip(*sorted(_ASPECT_RATIOS.items()))
+
+
+@lru_cache(maxsize=64)
+def _aspect_ratio_for(width: int, height: int) -> str:
+    return closest_aspect_ratio(_ASPECT_RATIO_KEYS, _ASPECT_RATIO_LABELS, width / height)
 
 
 class IdeogramBackend(ImageBackend):
@@ -36,12 +59,18 @@ class IdeogramBackend(ImageBackend):
         "render_3d",
         "anime",
     ]
+    _STYLE_PRESETS_UPPER = frozenset(s.upper() for s in STYLE_PRESETS)
 
     API_BASE = "https://api.ideogram.ai"
 
     def __init__(self):
         settings = get_settings()
         self.api_key = settings.ideogram_api_key
+        # Built once; every generate call sends the same headers
+        self._headers = {
+            "Api-Key": self.api_key,
+            "Content-Type": "application/json",
+        }
 
     async def generate(
         self,
@@ -56,7 +85,7 @@ class IdeogramBackend(ImageBackend):
         try:
             # Parse size
             size = self.validate_size(size)
-            width, height = map(int, size.split("x"))
+            width, height = self._size_dims[size]
 
             # Determine aspect ratio from size
             aspect_ratio = self._get_aspect_ratio(width, height)
@@ -72,7 +101,7 @@ class IdeogramBackend(ImageBackend):
             }
 
             # Add style if provided and valid
-            if style and style.upper() in [s.upper() for s in self.STYLE_PRESETS]:
+            if style and style.upper() in self._STYLE_PRESETS_UPPER:
                 payload["image_request"]["style_type"] = style.upper()
 
             # Add negative prompt
@@ -80,59 +109,54 @@ class IdeogramBackend(ImageBackend):
                 payload["image_request"]["negative_prompt"] = negative_prompt
 
             # Make API request
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.API_BASE}/generate",
-                    headers={
-                        "Api-Key": self.api_key,
-                        "Content-Type": "application/json",
-                    },
-                    json=payload,
-                    timeout=120.0,
+            client = get_http_client()
+            response = await client.post(
+                f"{self.API_BASE}/generate",
+                headers=self._headers,
+                content=orjson.dumps(payload),
+                timeout=120.0,
+            )
+
+            if response.status_code != 200:
+                error_data = orjson.loads(response.content) if response.content else {}
+                return GenerationResult(
+                    success=False,
+                    error=f"Ideogram API error: {response.status_code} - {error_data}",
                 )
 
-                if response.status_code != 200:
-                    error_data = response.json() if response.content else {}
-                    return GenerationResult(
-                        success=False,
-                        error=f"Ideogram API error: {response.status_code} - {error_data}",
-                    )
-
-                data = response.json()
-                images = data.get("data", [])
-
-                if not images:
-                    return GenerationResult(
-                        success=False,
-                        error="No images returned from Ideogram",
-                    )
-
-                # Get the first image URL
-                image_url = images[0].get("url")
-                if not image_url:
-                    return GenerationResult(
-                        success=False,
-                        error="No image URL in response",
-                    )
-
-                # Download the image
-                img_response = await client.get(image_url)
-                img_response.raise_for_status()
-                image_data = img_response.content
+            data = orjson.loads(response.content)
+            images = data.get("data", [])
 
+            if not images:
                 return GenerationResult(
-                    success=True,
-                    image_data=image_data,
-                    image_url=image_url,
-                    revised_prompt=images[0].get("prompt"),
-                    metadata={
-                        "model": payload["image_request"]["model"],
-                        "aspect_ratio": aspect_ratio,
-                        "style": style,
-                        "is_image_safe": images[0].get("is_image_safe"),
-                    },
+                    success=False,
+                    error="No images returned from Ideogram",
                 )
 
+            # Get the first image URL
+            image_url = images[0].get("url")
+            if not image_url:
+                return GenerationResult(
+                    success=False,
+                    error="No image URL in response",
+                )
+
+            # Download the image
+            image_data = await download_to_spool(image_url)
+
+            return GenerationResult(
+                success=True,
+                image_data=image_data,
+                image_url=image_url,
+                revised_prompt=images[0].get("prompt"),
+                metadata={
+                    "model": payload["image_request"]["model"],
+                    "aspect_ratio": aspect_ratio,
+                    "style": style,
+                    "is_image_safe": images[0].get("is_image_safe"),
+                },
+            )
+
         except Exception as e:
             return GenerationResult(
                 success=False,
@@ -141,21 +165,4 @@ class IdeogramBackend(ImageBackend):
 
     def _get_aspect_ratio(self, width: int, height: int) -> str:
         """Convert width/height to Ideogram aspect ratio string."""
-        ratio = width / height
-
-        # Map to supported aspect ratios
-        aspect_ratios = {
-            1.0: "ASPECT_1_1",
-            1.33: "ASPECT_4_3",
-            0.75: "ASPECT_3_4",
-            1.78: "ASPECT_16_9",
-            0.56: "ASPECT_9_16",
-            2.35: "ASPECT_21_9",
-            0.43: "ASPECT_9_21",
-            1.5: "ASPECT_3_2",
-            0.67: "ASPECT_2_3",
-        }
-
-        # Find closest match
-        closest_ratio = min(aspect_ratios.keys(), key=lambda x: abs(x - ratio))
-        return aspect_ratios[closest_ratio]
+        return _aspect_ratio_for(width, height)
@@ -1,10 +1,8 @@
 """DALL-E 3 image generation backend via OpenAI API."""
 
-import httpx
-from openai import AsyncOpenAI
-
 from backends.base import ImageBackend, GenerationResult
 from config import get_settings
+from services.http_client import download_to_spool
 
 
 class DallE3Backend(ImageBackend):
@@ -23,6 +21,10 @@ class DallE3Backend(ImageBackend):
 
     def __init__(self):
         settings = get_settings()
+        # Imported here: the openai package takes ~0.5s to import and is only
+        # needed once a DALL-E key is configured and the backend is used
+        from openai import AsyncOpenAI
+
         self.client = AsyncOpenAI(api_key=settings.openai_api_key)
 
     async def generate(
@@ -63,10 +65,7 @@ class DallE3Backend(ImageBackend):
             revised_prompt = response.data[0].revised_prompt
 
             # Download the image
-            async with httpx.AsyncClient() as http_client:
-                img_response = await http_client.get(image_url)
-                img_response.raise_for_status()
-                image_data = img_response.content
+            image_data = await download_to_spool(image_url)
 
             return GenerationResult(
                 success=True,
@@ -1,10 +1,30 @@
 """Flux image generation backend via Replicate API."""
 
-import httpx
-import replicate
+from functools import lru_cache
 
-from backends.base import ImageBackend, GenerationResult
+from backends.base import ImageBackend, GenerationResult, closest_aspect_ratio
 from config import get_settings
+from services.http_client import download_to_spool
+
+
+# Supported aspect ratios (width / height), split into sorted keys for bisect
+_ASPECT_RATIOS = {
+    1.0: "1:1",
+    1.78: "16:9",
+    0.56: "9:16",
+    1.33: "4:3",
+    0.75: "3:4",
+    2.33: "21:9",
+    0.43: "9:21",
+    1.5: "3:2",
+    0.67: "2:3",
+}
+_ASPECT_RATIO_KEYS, _ASPECT_RATIO_LABELS = zip(*sorted(_ASPECT_RATIOS.items()))
+
+
+@lru_cache(maxsize=64)
+def _aspect_ratio_for(width: int, height: int) -> str:
+    return closest_aspect_ratio(_ASPECT_RATIO_KEYS, _ASPECT_RATIO_LABELS, width / height)
 
 
 class FluxBackend(ImageBackend):
@@ -40,6 +60,10 @@ class FluxBackend(ImageBackend):
         self.api_token = settings.replicate_api_token
         self.model_variant = model_variant
         self.model = self.MODELS.get(model_variant, self.MODELS["schnell"])
+        # Reused across calls so Replicate's HTTP connections stay warm
+        import replicate  # heavy import (pulls in numpy), deferred until first use
+
+        self.client = replicate.Client(api_token=self.api_token)
 
     async def generate(
         self,
@@ -54,7 +78,7 @@ class FluxBackend(ImageBackend):
         try:
             # Parse size
             size = self.validate_size(size)
-            width, height = map(int, size.split("x"))
+            width, height = self._size_dims[size]
 
             # Select model based on quality
             model = self.model
@@ -81,21 +105,19 @@ class FluxBackend(ImageBackend):
                     "num_inference_steps", 28
                 )
 
-            # Run the model
-            client = replicate.Client(api_token=self.api_token)
-            output = client.run(model, input=input_params)
+            # Run the model (async so concurrent generations don't block the loop)
+            output = await self.client.async_run(model, input=input_params)
 
-            # Output is typically a list of URLs
-            if isinstance(output, list):
-                image_url = str(output[0])
-            else:
-                image_url = str(output)
+            # Output is a FileOutput (or a list of them); read its URL directly
+            item = output[0] if isinstance(output, list) else output
+            image_url = getattr(item, "url", None) or str(item)
 
-            # Download the image
-            async with httpx.AsyncClient() as http_client:
-                img_response = await http_client.get(image_url)
-                img_response.raise_for_status()
-                image_data = img_response.content
+            # Download the image; inline data: URLs are decoded by the SDK
+            if image_url.startswith("data:") and hasattr(item, "aread"):
+                image_data = await item.aread()
+                image_url = None
+            else:
+                image_data = await download_to_spool(image_url)
 
             return GenerationResult(
                 success=True,
@@ -118,21 +140,4 @@ class FluxBackend(ImageBackend):
 
     def _get_aspect_ratio(self, width: int, height: int) -> str:
         """Convert width/height to Flux aspect ratio string."""
-        ratio = width / height
-
-        # Map to supported aspect ratios
-        aspect_ratios = {
-            1.0: "1:1",
-            1.78: "16:9",
-            0.56: "9:16",
-            1.33: "4:3",
-            0.75: "3:4",
-            2.33: "21:9",
-            0.43: "9:21",
-            1.5: "3:2",
-            0.67: "2:3",
-        }
-
-        # Find closest match
-        closest_ratio = min(aspect_ratios.keys(), key=lambda x: abs(x - ratio))
-        return aspect_ratios[closest_ratio]
+        return _aspect_ratio_for(width, height)
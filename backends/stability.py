@@ -1,9 +1,10 @@
 """Stability AI image generation backend."""
 
-import httpx
+import orjson
 
 from backends.base import ImageBackend, GenerationResult
 from config import get_settings
+from services.http_client import get_http_client
 
 
 class StabilityBackend(ImageBackend):
@@ -44,6 +45,12 @@ class StabilityBackend(ImageBackend):
         settings = get_settings()
         self.api_key = settings.stability_api_key
         self.engine = self.ENGINES.get(engine, self.ENGINES["sdxl"])
+        # Built once; every generate call sends the same headers
+        self._headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+            "Accept": "image/png",
+        }
 
     async def generate(
         self,
@@ -58,7 +65,7 @@ class StabilityBackend(ImageBackend):
         try:
             # Parse size
             size = self.validate_size(size)
-            width, height = map(int, size.split("x"))
+            width, height = self._size_dims[size]
 
             # Determine steps based on quality
             steps = 30 if quality == "standard" else 50
@@ -85,60 +92,43 @@ class StabilityBackend(ImageBackend):
             if style:
                 payload["style_preset"] = style
 
-            # Make API request
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.API_BASE}/v1/generation/{self.engine}/text-to-image",
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json",
-                        "Accept": "application/json",
-                    },
-                    json=payload,
-                    timeout=120.0,
-                )
-
-                if response.status_code != 200:
-                    error_data = response.json() if response.content else {}
-                    return GenerationResult(
-                        success=False,
-                        error=f"Stability API error: {response.status_code} - {error_data}",
-                    )
-
-                data = response.json()
-                artifacts = data.get("artifacts", [])
-
-                if not artifacts:
-                    return GenerationResult(
-                        success=False,
-                        error="No images returned from Stability AI",
-                    )
-
-                # Get the first image (base64 encoded)
-                import base64
-
-                image_b64 = artifacts[0].get("base64")
-                if not image_b64:
-                    return GenerationResult(
-                        success=False,
-                        error="No image data in response",
-                    )
+            # Make API request. Asking for image/png returns the raw PNG, so
+            # there is no base64 payload to parse and decode.
+            client = get_http_client()
+            response = await client.post(
+                f"{self.API_BASE}/v1/generation/{self.engine}/text-to-image",
+                headers=self._headers,
+                content=orjson.dumps(payload),
+                timeout=120.0,
+            )
 
-                image_data = base64.b64decode(image_b64)
+            if response.status_code != 200:
+                error_data = orjson.loads(response.content) if response.content else {}
+                return GenerationResult(
+                    success=False,
+                    error=f"Stability API error: {response.status_code} - {error_data}",
+                )
 
+            image_data = response.content
+            if not image_data:
                 return GenerationResult(
-                    success=True,
-                    image_data=image_data,
-                    metadata={
-                        "engine": self.engine,
-                        "size": size,
-                        "quality": quality,
-                        "steps": steps,
-                        "cfg_scale": payload["cfg_scale"],
-                        "finish_reason": artifacts[0].get("finishReason"),
-                    },
+                    success=False,
+                    error="No image data in response",
                 )
 
+            return GenerationResult(
+                success=True,
+                image_data=image_data,
+                metadata={
+                    "engine": self.engine,
+                    "size": size,
+                    "quality": quality,
+                    "steps": steps,
+                    "cfg_scale": payload["cfg_scale"],
+                    "finish_reason": response.headers.get("finish-reason"),
+                },
+            )
+
         except Exception as e:
             return GenerationResult(
                 success=False,
@@ -1,6 +1,6 @@
 """Configuration management for the Ad Creative Agent."""
 
-from functools import lru_cache
+from functools import cached_property, lru_cache
 from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -19,11 +19,22 @@ class Settings(BaseSettings):
     host: str = "0.0.0.0"
     port: int = 8000
     debug: bool = False
+    # Uvicorn worker processes. Pillow text rendering holds the GIL between
+    # C calls, so extra processes scale compose throughput across cores.
+    # Caches and background video jobs are per process.
+    workers: int = 1
+    # Origins allowed to call the API from a browser (JSON list in the env,
+    # e.g. CORS_ORIGINS='["https://dify.example.com"]')
+    cors_origins: list[str] = ["*"]
 
     # Storage
     storage_type: Literal["local", "s3"] = "local"
     storage_local_path: str = "./outputs"
 
+    # Directory of Twemoji 72x72 PNGs named by codepoint (e.g. 1f680.png).
+    # Emoji found there are read from disk; others come from the CDN
+    twemoji_path: str = ""
+
     # S3 (optional)
     s3_bucket: str = ""
     s3_region: str = ""
@@ -49,8 +60,11 @@ class Settings(BaseSettings):
     vision_model: str = "gpt-4o"
     serper_api_key: str = ""
 
-    def get_available_image_backends(self) -> list[str]:
-        """Return list of configured image generation backends."""
+    # Settings are read once and never mutated, so the backend lists are
+    # computed on first access; callers must not modify the returned lists
+    @cached_property
+    def available_image_backends(self) -> list[str]:
+        """Configured image generation backends."""
         backends = []
         if self.openai_api_key:
             backends.append("dalle3")
@@ -62,8 +76,9 @@ class Settings(BaseSettings):
             backends.append("ideogram")
         return backends
 
-    def get_available_video_backends(self) -> list[str]:
-        """Return list of configured video generation backends."""
+    @cached_property
+    def available_video_backends(self) -> list[str]:
+        """Configured video generation backends."""
         backends = []
         if self.runway_api_key:
             backends.append("runway")
@@ -73,6 +88,14 @@ class Settings(BaseSettings):
             backends.append("kling")
         return backends
 
+    def get_available_image_backends(self) -> list[str]:
+        """Return list of configured image generation backends."""
+        return self.available_image_backends
+
+    def get_available_video_backends(self) -> list[str]:
+        """Return list of configured video generation backends."""
+        return self.available_video_backends
+
 
 @lru_cache
 def get_settings() -> Settings:
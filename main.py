@@ -1,5 +1,7 @@
 """FastAPI application entry point for Ad Creative Agent."""
 
+import asyncio
+import logging
 from contextlib import asynccontextmanager
 from pathlib import Path
 
@@ -7,30 +9,62 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
+from api.responses import ORJSONResponse
 from api.routes import router
 from config import get_settings
+from services.content_extractor import ContentExtractor
+from services.http_client import close_http_client, get_http_client
+from services.image_compositor import get_image_compositor
+
+
+# Fonts the Dify tools render with, loaded at startup so the first compose
+# doesn't pay FreeType's initialization and font parsing
+WARM_FONTS = ("impact", "liberation", "arial_bold")
+WARM_FONT_SIZES = (48, 72)
+
+settings = get_settings()
+
+# uvicorn configures only its own loggers. basicConfig is a no-op when the
+# root logger already has a handler (--log-config, or a library that called
+# it on import), so the level is set on this module's logger directly.
+logging.basicConfig(format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG if settings.debug else logging.INFO)
+
+# Created here rather than in lifespan: StaticFiles checks the directory at mount time
+outputs_path = Path(settings.storage_local_path)
+(outputs_path / "generated").mkdir(parents=True, exist_ok=True)
+
+
+def _warm_fonts() -> None:
+    compositor = get_image_compositor()
+    for font_name in WARM_FONTS:
+        for size in WARM_FONT_SIZES:
+            compositor._find_font(font_name, size)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
     # Startup
-    settings = get_settings()
+    app.state.outputs_path = outputs_path
 
-    # Ensure output directories exist
-    outputs_path = Path(settings.storage_local_path)
-    outputs_path.mkdir(parents=True, exist_ok=True)
-    (outputs_path / "generated").mkdir(exist_ok=True)
+    logger.info("Ad Creative Agent starting, storage path: %s", outputs_path.absolute())
+    # Repeated by every worker process, so only listed when debugging
+    logger.debug("Available image backends: %s", settings.get_available_image_backends())
+    logger.debug("Available video backends: %s", settings.get_available_video_backends())
 
-    print(f"Ad Creative Agent starting...")
-    print(f"Storage path: {outputs_path.absolute()}")
-    print(f"Available image backends: {settings.get_available_image_backends()}")
-    print(f"Available video backends: {settings.get_available_video_backends()}")
+    await asyncio.to_thread(_warm_fonts)
+    # Build the shared clients now rather than inside the first tool call
+    get_http_client()
+    if settings.openai_api_key:
+        ContentExtractor()  # builds the shared AsyncOpenAI client
 
     yield
 
     # Shutdown
-    print("Ad Creative Agent shutting down...")
+    logger.info("Ad Creative Agent shutting down")
+    await close_http_client()
 
 
 # Create FastAPI app
@@ -81,10 +115,12 @@ Configure backends via environment variables in `.env`:
 # Add CORS middleware (needed for Dify to call the API)
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Configure appropriately for production
+    allow_origins=settings.cors_origins,
     allow_credentials=True,
-    allow_methods=["*"],
+    allow_methods=["GET", "POST"],
     allow_headers=["*"],
+    # Let browsers reuse a preflight for a day instead of repeating it per call
+    max_age=86400,
 )
 
 # Include API routes
@@ -94,16 +130,12 @@ app.include_router(router, prefix="/api/v1")
 app.include_router(router)
 
 # Serve generated files
-settings = get_settings()
-outputs_path = Path(settings.storage_local_path)
-outputs_path.mkdir(parents=True, exist_ok=True)
 app.mount("/files", StaticFiles(directory=str(outputs_path)), name="files")
 
 
-@app.get("/", tags=["System"])
+@app.get("/", tags=["System"], response_class=ORJSONResponse)
 async def root():
     """Root endpoint with API info."""
-    settings = get_settings()
     return {
         "name": "Ad Creative Agent API",
         "version": "1.0.0",
@@ -121,10 +153,13 @@ async def root():
 if __name__ == "__main__":
     import uvicorn
 
-    settings = get_settings()
+    # uvicorn[standard] ships uvloop and httptools; "auto" picks them up
     uvicorn.run(
         "main:app",
         host=settings.host,
         port=settings.port,
         reload=settings.debug,
+        workers=1 if settings.debug else settings.workers,
+        loop="auto",
+        http="auto",
     )
@@ -1,18 +1,30 @@
-"""Services module for Ad Creative Agent."""
+"""Services module for Ad Creative Agent.
 
-from services.storage import StorageService, get_storage_service
-from services.reference_analyzer import ReferenceAnalyzer
-from services.web_search import WebSearchService
-from services.content_extractor import ContentExtractor
-from services.figma_composer import FigmaComposer, AdSize, AdSpec
+Exports resolve lazily (PEP 562), so importing one service module, e.g.
+services.image_compositor, doesn't also import every sibling service.
+"""
 
-__all__ = [
-    "StorageService",
-    "get_storage_service",
-    "ReferenceAnalyzer",
-    "WebSearchService",
-    "ContentExtractor",
-    "FigmaComposer",
-    "AdSize",
-    "AdSpec",
-]
+from importlib import import_module
+
+_EXPORTS = {
+    "StorageService": "services.storage",
+    "get_storage_service": "services.storage",
+    "ReferenceAnalyzer": "services.reference_analyzer",
+    "WebSearchService": "services.web_search",
+    "get_web_search_service": "services.web_search",
+    "ContentExtractor": "services.content_extractor",
+    "FigmaComposer": "services.figma_composer",
+    "AdSize": "services.figma_composer",
+    "AdSpec": "services.figma_composer",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
@@ -1,18 +1,103 @@
 """Content extraction service - extracts info from URLs, files, and raw text."""
 
-import httpx
-from openai import AsyncOpenAI
+import asyncio
+from functools import lru_cache
+from html.parser import HTMLParser
+
+import aiofiles
+import orjson
 from pathlib import Path
 
 from config import get_settings
+from services.http_client import get_http_client
+
+
+# Built once at import; only source_type and content vary per call
+_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You extract structured marketing information from content. Always respond with valid JSON.",
+}
+
+_EXTRACTION_PROMPT = """Analyze this {source_type} and extract key information for creating ad creatives.
+
+CONTENT:
+{content}
+
+Extract and return a JSON object with:
+{{
+    "product_name": "Name of the product/service/brand",
+    "company_name": "Company name if different from product",
+    "description": "Clear, concise description (2-3 sentences)",
+    "key_benefits": ["benefit 1", "benefit 2", "benefit 3"],
+    "target_audience": "Who this is for",
+    "unique_selling_points": ["USP 1", "USP 2"],
+    "tone": "Brand tone (professional/casual/playful/bold/etc)",
+    "industry": "Industry category",
+    "keywords": ["relevant", "keywords", "for", "ads"],
+    "pain_points_solved": ["pain point 1", "pain point 2"],
+    "call_to_action_suggestions": ["CTA 1", "CTA 2", "CTA 3"]
+}}
+
+Be specific and actionable. If something isn't clear from the content, make a reasonable inference based on context."""
+
+
+class _PageTextParser(HTMLParser):
+    """Collect a page's visible text plus its title/description meta tags."""
+
+    SKIP_TAGS = frozenset({"script", "style", "noscript", "svg", "template"})
+    META_KEYS = frozenset({"description", "og:title", "og:description"})
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: list[str] = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag == "meta":
+            meta = dict(attrs)
+            if (meta.get("name") or meta.get("property")) in self.META_KEYS and meta.get("content"):
+                self.parts.append(meta["content"])
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            text = " ".join(data.split())
+            if text:
+                self.parts.append(text)
+
+
+def _html_to_text(html: str) -> str:
+    """Strip markup, scripts and styles so the LLM budget goes to actual copy."""
+    parser = _PageTextParser()
+    try:
+        parser.feed(html)
+        parser.close()
+    except Exception:
+        return html
+    return "\n".join(parser.parts)
+
+
+@lru_cache
+def _get_openai_client():
+    """One AsyncOpenAI (and connection pool) shared by every extractor."""
+    from openai import AsyncOpenAI  # heavy import, deferred until first use
+
+    return AsyncOpenAI(api_key=get_settings().openai_api_key)
 
 
 class ContentExtractor:
     """Extracts and summarizes content from various sources for ad creation."""
 
+    # Content beyond this many characters is cut before prompting
+    MAX_CONTENT_CHARS = 15000
+
     def __init__(self):
-        settings = get_settings()
-        self.client = AsyncOpenAI(api_key=settings.openai_api_key)
+        self.client = _get_openai_client()
 
     async def extract_from_url(self, url: str) -> dict:
         """
@@ -23,18 +108,20 @@ class ContentExtractor:
         """
         try:
             # Fetch the webpage
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    url,
-                    follow_redirects=True,
-                    timeout=30.0,
-                    headers={"User-Agent": "Mozilla/5.0 (compatible; AdCreativeBot/1.0)"}
-                )
-                response.raise_for_status()
-                html_content = response.text
+            client = get_http_client()
+            response = await client.get(
+                url,
+                follow_redirects=True,
+                timeout=30.0,
+                headers={"User-Agent": "Mozilla/5.0 (compatible; AdCreativeBot/1.0)"}
+            )
+            response.raise_for_status()
+            # Send only the page text: tags and inline scripts cost tokens but carry no
+            # copy. Parsing is pure Python, so big pages are parsed off the event loop
+            page_text = await asyncio.to_thread(_html_to_text, response.text)
 
             # Use LLM to extract structured info
-            return await self._extract_with_llm(html_content, source_type="website")
+            return await self._extract_with_llm(page_text, source_type="website")
 
         except Exception as e:
             return {
@@ -51,8 +138,10 @@ class ContentExtractor:
             if not path.exists():
                 return {"success": False, "error": f"File not found: {file_path}"}
 
-            # Read file content
-            content = path.read_text(encoding="utf-8", errors="ignore")
+            # Read only the head the prompt can use (UTF-8 is at most 4 bytes per char)
+            async with aiofiles.open(path, "rb") as f:
+                raw = await f.read(self.MAX_CONTENT_CHARS * 4 + 4)
+            content = raw.decode("utf-8", errors="ignore")
 
             return await self._extract_with_llm(content, source_type="document")
 
@@ -72,37 +161,17 @@ class ContentExtractor:
         """Use LLM to extract structured information from content."""
 
         # Truncate if too long
-        max_chars = 15000
+        max_chars = self.MAX_CONTENT_CHARS
         if len(content) > max_chars:
             content = content[:max_chars] + "\n\n[Content truncated...]"
 
-        extraction_prompt = f"""Analyze this {source_type} and extract key information for creating ad creatives.
-
-CONTENT:
-{content}
-
-Extract and return a JSON object with:
-{{
-    "product_name": "Name of the product/service/brand",
-    "company_name": "Company name if different from product",
-    "description": "Clear, concise description (2-3 sentences)",
-    "key_benefits": ["benefit 1", "benefit 2", "benefit 3"],
-    "target_audience": "Who this is for",
-    "unique_selling_points": ["USP 1", "USP 2"],
-    "tone": "Brand tone (professional/casual/playful/bold/etc)",
-    "industry": "Industry category",
-    "keywords": ["relevant", "keywords", "for", "ads"],
-    "pain_points_solved": ["pain point 1", "pain point 2"],
-    "call_to_action_suggestions": ["CTA 1", "CTA 2", "CTA 3"]
-}}
-
-Be specific and actionable. If something isn't clear from the content, make a reasonable inference based on context."""
+        extraction_prompt = _EXTRACTION_PROMPT.format(source_type=source_type, content=content)
 
         try:
             response = await self.client.chat.completions.create(
                 model="gpt-4o",
                 messages=[
-                    {"role": "system", "content": "You extract structured marketing information from content. Always respond with valid JSON."},
+                    _SYSTEM_MESSAGE,
                     {"role": "user", "content": extraction_prompt}
                 ],
                 temperature=0.3,
@@ -110,8 +179,7 @@ Be specific and actionable. If something isn't clear from the content, make a re
                 response_format={"type": "json_object"}
             )
 
-            import json
-            result = json.loads(response.choices[0].message.content)
+            result = orjson.loads(response.choices[0].message.content)
             result["success"] = True
             result["source_type"] = source_type
             return result
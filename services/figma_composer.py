@@ -47,7 +47,7 @@ class AdSize(Enum):
     PORTRAIT = (1080, 1920)
 
 
-@dataclass
+@dataclass(slots=True)
 class TextElement:
     """Text element specification for Figma."""
     content: str
@@ -63,7 +63,7 @@ class TextElement:
     text_align: str = "center"  # "left", "center", "right"
 
 
-@dataclass
+@dataclass(slots=True)
 class ImageElement:
     """Image element specification for Figma."""
     image_url: str  # URL or local path
@@ -76,7 +76,7 @@ class ImageElement:
     corner_radius: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class AdSpec:
     """Complete ad specification."""
     name: str
@@ -110,6 +110,24 @@ class FigmaComposer:
         "body_color": "#4A4A68",
     }
 
+    # Fixed footer appended to every set of Figma instructions
+    LAYOUT_NOTES = """
+## Layout Notes
+- Ensure proper visual hierarchy
+- Text should be readable and not overlap awkwardly with images
+- Maintain consistent spacing between elements
+"""
+
+    # Recommended sizes per platform
+    PLATFORM_SIZES = {
+        "instagram": (AdSize.INSTAGRAM_SQUARE, AdSize.INSTAGRAM_STORY, AdSize.INSTAGRAM_PORTRAIT),
+        "facebook": (AdSize.FACEBOOK_FEED, AdSize.FACEBOOK_SQUARE, AdSize.FACEBOOK_STORY),
+        "twitter": (AdSize.TWITTER_POST, AdSize.TWITTER_CARD),
+        "linkedin": (AdSize.LINKEDIN_POST, AdSize.LINKEDIN_SQUARE),
+        "google": (AdSize.GOOGLE_MEDIUM_RECTANGLE, AdSize.GOOGLE_LEADERBOARD),
+        "telegram": (AdSize.TELEGRAM_POST, AdSize.INSTAGRAM_SQUARE),
+    }
+
     def create_meme_ad_spec(
         self,
         size: AdSize,
@@ -250,7 +268,7 @@ class FigmaComposer:
         """Convert an AdSpec to natural language instructions for Figma MCP."""
         width, height = spec.size.value
 
-        instructions = f"""Create a new Figma frame with these specifications:
+        parts = [f"""Create a new Figma frame with these specifications:
 
 ## Frame Setup
 - Name: "{spec.name}"
@@ -259,21 +277,21 @@ class FigmaComposer:
 - Padding: {spec.padding}px on all sides
 
 ## Images
-"""
+"""]
         for i, img in enumerate(spec.images, 1):
-            instructions += f"""
+            parts.append(f"""
 ### Image {i}
 - Source: {img.image_url}
 - Position: {img.position}
 - Opacity: {img.opacity * 100}%
-"""
+""")
             if img.corner_radius:
-                instructions += f"- Corner radius: {img.corner_radius}px\n"
+                parts.append(f"- Corner radius: {img.corner_radius}px\n")
 
-        instructions += "\n## Text Elements\n"
+        parts.append("\n## Text Elements\n")
 
         for i, text in enumerate(spec.texts, 1):
-            instructions += f"""
+            parts.append(f"""
 ### Text {i} ({text.role})
 - Content: "{text.content}"
 - Font: {text.font_family} {text.font_weight}
@@ -281,27 +299,13 @@ class FigmaComposer:
 - Color: {text.color}
 - Position: {text.position}
 - Alignment: {text.text_align}
-"""
+""")
             if text.max_width:
-                instructions += f"- Max width: {text.max_width}px (wrap text)\n"
-
-        instructions += """
-## Layout Notes
-- Ensure proper visual hierarchy
-- Text should be readable and not overlap awkwardly with images
-- Maintain consistent spacing between elements
-"""
+                parts.append(f"- Max width: {text.max_width}px (wrap text)\n")
 
-        return instructions
+        parts.append(self.LAYOUT_NOTES)
+        return "".join(parts)
 
     def get_platform_sizes(self, platform: str) -> list[AdSize]:
         """Get recommended ad sizes for a platform."""
-        platform_sizes = {
-            "instagram": [AdSize.INSTAGRAM_SQUARE, AdSize.INSTAGRAM_STORY, AdSize.INSTAGRAM_PORTRAIT],
-            "facebook": [AdSize.FACEBOOK_FEED, AdSize.FACEBOOK_SQUARE, AdSize.FACEBOOK_STORY],
-            "twitter": [AdSize.TWITTER_POST, AdSize.TWITTER_CARD],
-            "linkedin": [AdSize.LINKEDIN_POST, AdSize.LINKEDIN_SQUARE],
-            "google": [AdSize.GOOGLE_MEDIUM_RECTANGLE, AdSize.GOOGLE_LEADERBOARD],
-            "telegram": [AdSize.TELEGRAM_POST, AdSize.INSTAGRAM_SQUARE],
-        }
-        return platform_sizes.get(platform.lower(), [AdSize.SQUARE])
+        return list(self.PLATFORM_SIZES.get(platform.lower(), (AdSize.SQUARE,)))
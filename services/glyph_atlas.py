@@ -0,0 +1,78 @@
+"""Cached text measurement and outlined text rendering.
+
+Outlines use Pillow's native stroke, which rasterizes the outline once in
+FreeType instead of stamping the text at every (2w+1)^2 offset around the
+anchor. The stroke and fill coverage masks of each line are cached, so
+recurring copy (CTAs like "SHOP NOW", a hook reused across variations) is
+blitted from the cache instead of rasterized again. Line bounding boxes are
+memoized too, since layout measures each line while wrapping, while sizing
+and again while drawing.
+"""
+
+from functools import lru_cache
+
+from PIL import Image, ImageDraw, ImageFilter, ImageFont
+
+
+@lru_cache(maxsize=4096)
+def text_bbox(font: ImageFont.FreeTypeFont, text: str) -> tuple[int, int, int, int]:
+    """font.getbbox, memoized: layout measures the same lines several times."""
+    return font.getbbox(text)
+
+
+@lru_cache(maxsize=4096)
+def text_length(font: ImageFont.FreeTypeFont, text: str) -> float:
+    """font.getlength (advance width), memoized like text_bbox."""
+    return font.getlength(text)
+
+
+@lru_cache(maxsize=256)
+def text_mask(
+    font: ImageFont.FreeTypeFont, text: str, stroke_width: int = 0
+) -> tuple[Image.Image, tuple[int, int]]:
+    """
+    Coverage mask of text (stroked by stroke_width, interior filled) and its
+    offset from the drawing origin.
+
+    Painting it with draw.bitmap at origin + offset gives the same pixels as
+    draw.text at origin with that stroke.
+    """
+    left, top, right, bottom = font.getbbox(text, stroke_width=stroke_width)
+    mask = Image.new("L", (max(right - left, 1), max(bottom - top, 1)), 0)
+    ImageDraw.Draw(mask).text(
+        (-left, -top), text, font=font, fill=255, stroke_width=stroke_width, stroke_fill=255
+    )
+    return mask, (left, top)
+
+
+def draw_outlined_text(
+    draw: ImageDraw.ImageDraw,
+    position: tuple[int, int],
+    text: str,
+    font: ImageFont.FreeTypeFont,
+    fill="white",
+    outline="black",
+    outline_width: int = 2,
+) -> None:
+    """Draw text with an outline of outline_width pixels around every glyph."""
+    x, y = position
+    if not isinstance(font, ImageFont.FreeTypeFont):
+        # Bitmap fonts can't stroke: rasterize the text once to a mask and
+        # dilate it with a square max filter, which covers the same pixels as
+        # stamping the text at every offset around the anchor
+        left, top, right, bottom = draw.textbbox((0, 0), text, font=font)
+        pad = outline_width
+        mask = Image.new("L", (right - left + 2 * pad, bottom - top + 2 * pad), 0)
+        ImageDraw.Draw(mask).text((pad - left, pad - top), text, font=font, fill=255)
+        outline_mask = mask.filter(ImageFilter.MaxFilter(2 * outline_width + 1))
+        draw.bitmap((x + left - pad, y + top - pad), outline_mask, fill=outline)
+        draw.text((x, y), text, font=font, fill=fill)
+        return
+
+    # Stroke first, then the fill over it, as draw.text(stroke_width=...) does
+    passes = [(0, fill)]
+    if outline_width > 0:
+        passes = [(outline_width, outline)] if fill == outline else [(outline_width, outline), (0, fill)]
+    for stroke_width, ink in passes:
+        mask, (left, top) = text_mask(font, text, stroke_width)
+        draw.bitmap((x + left, y + top), mask, fill=ink)
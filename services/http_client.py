@@ -0,0 +1,81 @@
+"""Shared async HTTP client for outbound requests."""
+
+import tempfile
+from typing import BinaryIO
+
+import httpx
+
+# One pooled client per process, so repeated calls to the same host reuse
+# keep-alive connections instead of paying a TCP/TLS handshake each time.
+_client: httpx.AsyncClient | None = None
+# Blocking twin for code that runs on worker threads (e.g. emoji fetches mid-render)
+_sync_client: httpx.Client | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared AsyncClient, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+            # Per-call timeouts still override this; the default covers image
+            # downloads, which outgrow httpx's 5s default on slow CDNs
+            timeout=httpx.Timeout(120.0, connect=10.0),
+            # Multiplex concurrent calls to one API host over a single connection.
+            # Accept-Encoding is left to httpx, which adds br when brotli is installed
+            http2=True,
+        )
+    return _client
+
+
+def get_sync_http_client() -> httpx.Client:
+    """Get the shared blocking Client, creating it on first use."""
+    global _sync_client
+    if _sync_client is None or _sync_client.is_closed:
+        _sync_client = httpx.Client(
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            timeout=httpx.Timeout(30.0, connect=10.0),
+        )
+    return _sync_client
+
+
+async def close_http_client() -> None:
+    """Close the shared clients (called on application shutdown)."""
+    global _client, _sync_client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+    if _sync_client is not None:
+        _sync_client.close()
+        _sync_client = None
+
+
+async def read_to_spool(response: httpx.Response, max_memory: int = 2 * 1024 * 1024) -> BinaryIO:
+    """
+    Read a streamed response body into a SpooledTemporaryFile, rewound.
+
+    Bodies up to max_memory stay in RAM; bigger ones spill to disk instead
+    of being held as one bytes object. The caller owns (and should close)
+    the returned file.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=max_memory)
+    try:
+        async for chunk in response.aiter_bytes(64 * 1024):
+            spool.write(chunk)
+    except BaseException:
+        spool.close()
+        raise
+    spool.seek(0)
+    return spool
+
+
+async def download_to_spool(url: str, max_memory: int = 2 * 1024 * 1024) -> BinaryIO:
+    """
+    Stream a GET into a SpooledTemporaryFile and return it rewound.
+
+    Raises on HTTP error statuses. The caller owns (and should close) the
+    returned file.
+    """
+    async with get_http_client().stream("GET", url) as response:
+        response.raise_for_status()
+        return await read_to_spool(response, max_memory)
@@ -1,14 +1,113 @@
 """Image compositor - adds text overlays to generated images."""
 
+import asyncio
 import io
+import logging
 import math
-from pathlib import Path
+import os
+import tempfile
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from types import MappingProxyType
 from PIL import Image, ImageDraw, ImageFont
-import httpx
 import emoji
 
+from config import get_settings
+from services.glyph_atlas import draw_outlined_text, text_bbox, text_length
+from services.http_client import get_http_client, get_sync_http_client, read_to_spool
+from services.image_fit import fit_to_size
 from services.storage import get_storage_service
 
+logger = logging.getLogger(__name__)
+
+# Shared pool for CPU-bound Pillow rendering. Pillow releases the GIL inside
+# its C image ops, so compositions on different threads run in parallel.
+_RENDER_WORKERS = os.cpu_count() or 4
+_RENDER_POOL = ThreadPoolExecutor(
+    max_workers=_RENDER_WORKERS,
+    thread_name_prefix="compositor",
+)
+
+
+async def _run_in_pool(func, /, *args, **kwargs):
+    """Run a blocking render function on the shared pool without blocking the loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_RENDER_POOL, partial(func, *args, **kwargs))
+
+
+# Longest side of any output size; sources are never decoded smaller than this
+_DECODE_MIN_SIDE = 1920
+
+
+def _decode_image(fp) -> Image.Image:
+    """Open and fully decode an image so callers can copy() the pixels cheaply.
+
+    Large JPEGs are decoded with libjpeg's DCT scaling (1/2, 1/4 or 1/8) down
+    to the smallest scale that still covers every output size, so 4K+ photos
+    never materialize at full resolution. draft() is a no-op for other formats.
+    """
+    img = Image.open(fp)
+    img.draft(img.mode, (_DECODE_MIN_SIDE, _DECODE_MIN_SIDE))
+    img.load()
+    return img
+
+
+@lru_cache(maxsize=512)
+def _load_font(path: str, size: int) -> ImageFont.FreeTypeFont:
+    """Load a TrueType font once per (path, size) and reuse it across calls."""
+    return ImageFont.truetype(path, size)
+
+
+@lru_cache(maxsize=4096)
+def _split_emoji(text: str) -> tuple[tuple[str, bool], ...]:
+    """Split text into (segment, is_emoji) runs.
+
+    Memoized, since emoji scanning is pure Python and the font-size search
+    measures the same wrap candidates again at every size it tries.
+    """
+    entries = emoji.emoji_list(text)
+    if not entries:
+        return ((text, False),) if text else ()
+
+    segments: list[tuple[str, bool]] = []
+    last = 0
+    for entry in entries:
+        start = entry.get("match_start", entry.get("location", 0))
+        end = entry.get("match_end", start + len(entry["emoji"]))
+        if start > last:
+            segments.append((text[last:start], False))
+        segments.append((entry["emoji"], True))
+        last = end
+    if last < len(text):
+        segments.append((text[last:], False))
+    return tuple(segments)
+
+
+def _largest_fitting(sizes: range, measure, fits):
+    """
+    Binary-search sizes (ordered largest first) for the first one whose
+    measure(size) fits, and return that measurement.
+
+    Text height grows with font size, so this probes O(log n) sizes instead
+    of stepping down one at a time. If nothing fits, the last (smallest)
+    size is measured and returned, like the linear search it replaces.
+    """
+    lo, hi = 0, len(sizes) - 1
+    found = None
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        measured = measure(sizes[mid])
+        if fits(measured):
+            found = measured
+            hi = mid - 1
+        else:
+            lo = mid + 1
+    if found is None:
+        found = measure(sizes[-1])
+    return found
+
 
 class ImageCompositor:
     """Composes final ad images with text overlays."""
@@ -57,7 +156,8 @@ class ImageCompositor:
         "classic": "arial",
     }
 
-    FONT_PATHS = {
+    # Read-only; __init__ filters it down to the fonts present on this host
+    FONT_PATHS = MappingProxyType({
         # Bold fonts - prioritize Cyrillic support
         "impact": [
             "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",  # Linux - good Cyrillic
@@ -98,10 +198,10 @@ class ImageCompositor:
         "noto_emoji": [
             "/usr/share/fonts/truetype/noto/NotoColorEmoji.ttf",  # Linux Docker
         ],
-    }
+    })
 
-    # Ad size presets
-    SIZES = {
+    # Ad size presets (read-only, shared by every compositor instance)
+    SIZES = MappingProxyType({
         # Instagram
         "instagram_square": (1080, 1080),
         "instagram_story": (1080, 1920),
@@ -122,7 +222,10 @@ class ImageCompositor:
         "youtube_shorts": (1080, 1920),
         # Telegram
         "telegram": (1280, 720),
-    }
+    })
+
+    # Fallback for unknown output_size names
+    _DEFAULT_SIZE = SIZES["instagram_square"]
 
     # Map output sizes to safe zone profiles
     SIZE_TO_SAFE_ZONE = {
@@ -135,65 +238,179 @@ class ImageCompositor:
         # All others use "none" (basic padding)
     }
 
+    # Max variations in flight per batch: at least one per render thread, so
+    # big hosts aren't capped at 5 while small ones still overlap saves
+    BATCH_CONCURRENCY = max(5, _RENDER_WORKERS)
+
+    # zlib level for output PNGs: level 1 encodes ~5x faster than the default 6
+    # for ~15% larger files, and these are re-encoded by every ad platform anyway
+    PNG_COMPRESS_LEVEL = 1
+
+    # Twemoji PNGs fetched from the CDN, kept across restarts. Sources are
+    # ~2-3KB at 72px and sized per use in memory, so even the full set stays
+    # around 10MB and needs no eviction
+    EMOJI_CACHE_DIR = os.path.join(tempfile.gettempdir(), "creo_emoji_cache")
+
+    # compose() output encodings: output_format -> (Pillow format, save options, MIME type).
+    # JPEG suits photo backgrounds with no transparency: it encodes several
+    # times faster than PNG and comes out a fraction of the size. WebP is
+    # smaller still at similar quality, for destinations that accept it
+    OUTPUT_FORMATS = MappingProxyType({
+        "png": ("PNG", {"compress_level": PNG_COMPRESS_LEVEL}, "image/png"),
+        "jpeg": ("JPEG", {"quality": 90, "progressive": True}, "image/jpeg"),
+        "webp": ("WEBP", {"quality": 88, "method": 4}, "image/webp"),
+    })
+
+    # Decoded-pixel budget for the background image cache (~100MB)
+    IMAGE_CACHE_MAX_BYTES = 100 * 1024 * 1024
+
+    # compose() starts every block at one size and font pair: bold hook,
+    # regular body/CTA
+    COMPOSE_FONT_SIZE = 65
+    COMPOSE_BOLD_FONT = "impact"
+    COMPOSE_REGULAR_FONT = "liberation"
+
     def __init__(self):
         self.storage = get_storage_service()
         self._emoji_cache: dict[tuple[str, int], Image.Image] = {}
+        # Decoded 72px Twemoji sources by emoji, resized into _emoji_cache per size
+        self._emoji_sources: dict[str, Image.Image] = {}
+        self._twemoji_dir = get_settings().twemoji_path
+        # Resolved font by (font_name, size), so unreadable candidates and the
+        # load_default() fallback are tried once rather than on every lookup
+        self._font_cache: dict[tuple[str, int], ImageFont.FreeTypeFont] = {}
+        # Line wraps by (text, font, max_width): compose() wraps the same copy
+        # while warming up, while sizing and again when drawing
+        self._wrap_cached = lru_cache(maxsize=1024)(self._wrap_lines)
+        # In-flight source loads, so concurrent requests for one URL share a decode
+        self._pending_loads: dict[str, asyncio.Task] = {}
+        # Decoded background images by URL: url -> (image, etag, last_modified, nbytes)
+        self._image_cache: OrderedDict[str, tuple[Image.Image, str | None, str | None, int]] = OrderedDict()
+        self._image_cache_bytes = 0
+        # Font candidates that exist on this host, checked once instead of per lookup
+        self._font_paths = {
+            name: [path for path in paths if os.path.isfile(path)]
+            for name, paths in self.FONT_PATHS.items()
+        }
 
     def _find_font(self, font_name: str, size: int, text: str = "") -> ImageFont.FreeTypeFont:
         """Find and load a font, with fallbacks."""
-        paths = self.FONT_PATHS.get(font_name, self.FONT_PATHS["impact"])
+        cache_key = (font_name, size)
+        font = self._font_cache.get(cache_key)
+        if font is not None:
+            return font
+
+        paths = self._font_paths.get(font_name, self._font_paths["impact"])
 
         for path in paths:
-            if Path(path).exists():
-                try:
-                    return ImageFont.truetype(path, size)
-                except Exception:
-                    continue
-        
-        return ImageFont.load_default()
+            try:
+                font = _load_font(path, size)
+                break
+            except Exception:
+                continue
+        else:
+            font = ImageFont.load_default()
+
+        self._font_cache[cache_key] = font
+        return font
 
     def _emoji_render_size(self, font: ImageFont.FreeTypeFont) -> int:
         return max(12, int(font.size * 0.95))
 
+    def _emoji_codepoints(self, emoji_char: str) -> str:
+        return "-".join(f"{ord(ch):x}" for ch in emoji_char)
+
     def _emoji_to_twemoji_url(self, emoji_char: str) -> str:
-        codepoints = "-".join(f"{ord(ch):x}" for ch in emoji_char)
+        codepoints = self._emoji_codepoints(emoji_char)
         return f"https://cdnjs.cloudflare.com/ajax/libs/twemoji/14.0.2/72x72/{codepoints}.png"
 
+    def _load_local_emoji(self, emoji_char: str) -> Image.Image | None:
+        """Decode an emoji from the Twemoji directory or the on-disk fetch cache."""
+        filename = f"{self._emoji_codepoints(emoji_char)}.png"
+        for directory in (self._twemoji_dir, self.EMOJI_CACHE_DIR):
+            if not directory:
+                continue
+            try:
+                with open(os.path.join(directory, filename), "rb") as f:
+                    return self._decode_emoji(emoji_char, f.read())
+            except OSError:
+                continue
+        return None
+
+    def _store_fetched_emoji(self, emoji_char: str, data: bytes) -> Image.Image:
+        """Decode a Twemoji PNG fetched from the CDN and persist it, so restarts
+        and sibling workers read it from disk instead of the network."""
+        img = self._decode_emoji(emoji_char, data)
+        path = os.path.join(self.EMOJI_CACHE_DIR, f"{self._emoji_codepoints(emoji_char)}.png")
+        try:
+            os.makedirs(self.EMOJI_CACHE_DIR, exist_ok=True)
+            # Write then rename, so concurrent workers never read a partial file
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+        return img
+
     def _get_emoji_image(self, emoji_char: str, size: int) -> Image.Image | None:
         cache_key = (emoji_char, size)
         cached = self._emoji_cache.get(cache_key)
         if cached is not None:
             return cached
 
-        url = self._emoji_to_twemoji_url(emoji_char)
+        source = self._emoji_sources.get(emoji_char) or self._load_local_emoji(emoji_char)
+        if source is None:
+            # Not prefetched or bundled: fetch from the render thread on the blocking client
+            try:
+                resp = get_sync_http_client().get(self._emoji_to_twemoji_url(emoji_char), timeout=5.0)
+                resp.raise_for_status()
+                source = self._store_fetched_emoji(emoji_char, resp.content)
+            except Exception:
+                return None
+
+        img = source
+        if img.size != (size, size):
+            img = img.resize((size, size), Image.Resampling.LANCZOS)
+        self._emoji_cache[cache_key] = img
+        return img
+
+    def _decode_emoji(self, emoji_char: str, data: bytes) -> Image.Image:
+        """Decode a fetched Twemoji PNG and keep it for resizing to any size."""
+        img = Image.open(io.BytesIO(data)).convert("RGBA")
+        self._emoji_sources[emoji_char] = img
+        return img
+
+    async def _prefetch_emojis(self, *texts: str) -> None:
+        """Fetch the Twemoji images for texts on the shared async client.
+
+        Emoji sizes depend on the font size the layout settles on, so this
+        fetches the size-independent source PNGs, all at once; the render
+        then only resizes them instead of blocking a pool thread on the
+        network. Failures are left for the render's own fetch (and its fallback).
+        """
+        missing = {
+            segment
+            for text in texts
+            if text
+            for segment, is_emoji in _split_emoji(text)
+            if is_emoji and segment not in self._emoji_sources
+        }
+        if missing:
+            await asyncio.gather(*(self._prefetch_emoji(emoji_char) for emoji_char in missing))
+
+    async def _prefetch_emoji(self, emoji_char: str) -> None:
+        if await _run_in_pool(self._load_local_emoji, emoji_char) is not None:
+            return
         try:
-            resp = httpx.get(url, timeout=5.0)
+            resp = await get_http_client().get(self._emoji_to_twemoji_url(emoji_char), timeout=5.0)
             resp.raise_for_status()
-            img = Image.open(io.BytesIO(resp.content)).convert("RGBA")
-            if img.size != (size, size):
-                img = img.resize((size, size), Image.Resampling.LANCZOS)
-            self._emoji_cache[cache_key] = img
-            return img
+            await _run_in_pool(self._store_fetched_emoji, emoji_char, resp.content)
         except Exception:
-            return None
-
-    def _iter_text_segments(self, text: str) -> list[tuple[str, bool]]:
-        entries = emoji.emoji_list(text)
-        if not entries:
-            return [(text, False)] if text else []
-
-        segments: list[tuple[str, bool]] = []
-        last = 0
-        for entry in entries:
-            start = entry.get("match_start", entry.get("location", 0))
-            end = entry.get("match_end", start + len(entry["emoji"]))
-            if start > last:
-                segments.append((text[last:start], False))
-            segments.append((entry["emoji"], True))
-            last = end
-        if last < len(text):
-            segments.append((text[last:], False))
-        return segments
+            pass
+
+    def _iter_text_segments(self, text: str) -> tuple[tuple[str, bool], ...]:
+        return _split_emoji(text)
 
     def _measure_text_mixed(
         self,
@@ -208,10 +425,14 @@ class ImageCompositor:
             if is_emoji:
                 width += emoji_size
             else:
-                bbox = font.getbbox(segment)
+                bbox = text_bbox(font, segment)
                 width += bbox[2] - bbox[0]
         return width
 
+    def _line_heights(self, font: ImageFont.FreeTypeFont, lines: list[str]) -> list[int]:
+        """Ink height (bbox bottom - top) of each line, measured once for layout and drawing."""
+        return [bottom - top for _, top, _, bottom in (text_bbox(font, line) for line in lines)]
+
     def _wrap_text(
         self,
         text: str,
@@ -219,23 +440,74 @@ class ImageCompositor:
         max_width: int,
     ) -> list[str]:
         """Wrap text to fit within max_width."""
-        words = text.split()
+        return list(self._wrap_cached(text, font, max_width))
+
+    def _wrap_lines(
+        self,
+        text: str,
+        font: ImageFont.FreeTypeFont,
+        max_width: int,
+    ) -> tuple[str, ...]:
+        """Uncached wrap behind _wrap_text; a tuple, so cached results stay intact."""
+        if not isinstance(font, ImageFont.FreeTypeFont) or any(
+            is_emoji for _, is_emoji in _split_emoji(text)
+        ):
+            return tuple(self._wrap_text_measured(text, font, max_width))
+
+        # A candidate line's ink width is the advance of the line so far plus
+        # a space, plus the new word's ink extent, so each word is measured
+        # once instead of re-measuring the whole growing line. Estimates within
+        # a couple of pixels of max_width (kerning, rounding) are re-measured.
+        space = text_length(font, " ")
+        lines = []
+        line_words: list[str] = []
+        advance = 0.0
+        left = 0
+
+        for word in text.split():
+            word_left, _, word_right, _ = text_bbox(font, word)
+            if line_words:
+                width = round(advance + space) + word_right - left
+                if abs(width - max_width) <= 2:
+                    test_left, _, test_right, _ = text_bbox(font, f"{' '.join(line_words)} {word}")
+                    width = test_right - test_left
+                if width <= max_width:
+                    line_words.append(word)
+                    advance += space + text_length(font, word)
+                    continue
+                lines.append(" ".join(line_words))
+            line_words = [word]
+            left = word_left
+            advance = text_length(font, word)
+
+        if line_words:
+            lines.append(" ".join(line_words))
+
+        return tuple(lines)
+
+    def _wrap_text_measured(
+        self,
+        text: str,
+        font: ImageFont.FreeTypeFont,
+        max_width: int,
+    ) -> list[str]:
+        """Wrap text by measuring every candidate line (handles emoji segments)."""
         lines = []
-        current_line = []
+        current_line = ""
 
-        for word in words:
-            test_line = ' '.join(current_line + [word])
+        for word in text.split():
+            test_line = f"{current_line} {word}" if current_line else word
             width = self._measure_text_mixed(test_line, font)
 
             if width <= max_width:
-                current_line.append(word)
+                current_line = test_line
             else:
                 if current_line:
-                    lines.append(' '.join(current_line))
-                current_line = [word]
+                    lines.append(current_line)
+                current_line = word
 
         if current_line:
-            lines.append(' '.join(current_line))
+            lines.append(current_line)
 
         return lines
 
@@ -255,25 +527,19 @@ class ImageCompositor:
         Returns:
             (font, wrapped_lines)
         """
-        # Try sizes from max down to min, stepping by 1 for best fit
-        for size in range(max_font_size, min_font_size - 1, -1):
+        def measure(size: int) -> tuple[ImageFont.FreeTypeFont, list[str], int]:
             font = self._find_font(font_name, size, text=text)
             lines = self._wrap_text(text, font, max_width)
-
-            # Calculate total height needed
-            total_height = 0
-            for line in lines:
-                bbox = font.getbbox(line)
-                line_height = bbox[3] - bbox[1]
-                total_height += line_height + 5  # 5px line spacing
-
-            # If it fits, return this size
-            if total_height <= max_height:
-                return font, lines
-
-        # If nothing fits, use minimum size anyway
-        font = self._find_font(font_name, min_font_size, text=text)
-        lines = self._wrap_text(text, font, max_width)
+            # 5px line spacing
+            total_height = sum(h + 5 for h in self._line_heights(font, lines))
+            return font, lines, total_height
+
+        # Largest size whose wrapped text fits; the minimum size if none does
+        font, lines, _ = _largest_fitting(
+            range(max_font_size, min_font_size - 1, -1),
+            measure,
+            lambda measured: measured[2] <= max_height,
+        )
         return font, lines
 
     def _draw_text_with_outline_mixed(
@@ -304,13 +570,11 @@ class ImageCompositor:
                 x += emoji_size
                 continue
 
-            for dx in range(-outline_width, outline_width + 1):
-                for dy in range(-outline_width, outline_width + 1):
-                    if dx != 0 or dy != 0:
-                        draw.text((x + dx, y + dy), segment, font=font, fill=outline)
-
-            draw.text((x, y), segment, font=font, fill=fill)
-            bbox = font.getbbox(segment)
+            draw_outlined_text(
+                draw, (x, y), segment, font,
+                fill=fill, outline=outline, outline_width=outline_width
+            )
+            bbox = text_bbox(font, segment)
             x += bbox[2] - bbox[0]
 
     def _draw_text_with_outline(
@@ -324,16 +588,10 @@ class ImageCompositor:
         outline_width: int = 2,
     ):
         """Draw text with outline/stroke effect."""
-        x, y = position
-
-        # Draw outline
-        for dx in range(-outline_width, outline_width + 1):
-            for dy in range(-outline_width, outline_width + 1):
-                if dx != 0 or dy != 0:
-                    draw.text((x + dx, y + dy), text, font=font, fill=outline)
-
-        # Draw main text
-        draw.text((x, y), text, font=font, fill=fill)
+        draw_outlined_text(
+            draw, position, text, font,
+            fill=fill, outline=outline, outline_width=outline_width
+        )
 
     def _draw_text_with_shadow(
         self,
@@ -354,6 +612,85 @@ class ImageCompositor:
         # Draw main text
         draw.text((x, y), text, font=font, fill=fill)
 
+    async def _load_image(self, image_source: str) -> Image.Image:
+        """Fetch (URL) or open (file path) a source image and decode it.
+
+        The decode runs on the render pool so large JPEGs do not stall the loop.
+        URLs that carry an ETag or Last-Modified are cached decoded and
+        revalidated with a conditional GET, so agents iterating copy on one
+        background skip the download and decode. The returned image may be
+        shared with the cache: copy() it before drawing on it.
+        """
+        if not image_source.startswith("http"):
+            return await _run_in_pool(_decode_image, image_source)
+
+        cached = self._image_cache.get(image_source)
+        headers = {}
+        if cached is not None:
+            _, etag, last_modified, _ = cached
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        client = get_http_client()
+        # Stream the body into a spool rather than buffering response.content,
+        # so large backgrounds spill to disk instead of sitting in RAM twice
+        async with client.stream("GET", image_source, headers=headers) as response:
+            if cached is not None and response.status_code == 304:
+                self._image_cache.move_to_end(image_source)
+                return cached[0]
+
+            response.raise_for_status()
+            body = await read_to_spool(response)
+            etag = response.headers.get("etag")
+            last_modified = response.headers.get("last-modified")
+
+        try:
+            img = await _run_in_pool(_decode_image, body)
+        finally:
+            body.close()
+
+        if etag or last_modified:
+            self._cache_image(image_source, img, etag, last_modified)
+        return img
+
+    def _cache_image(
+        self, url: str, img: Image.Image, etag: str | None, last_modified: str | None
+    ) -> None:
+        """Store a decoded image, evicting least recently used ones over budget."""
+        nbytes = img.width * img.height * len(img.getbands())
+        if nbytes > self.IMAGE_CACHE_MAX_BYTES:
+            return
+
+        old = self._image_cache.pop(url, None)
+        if old is not None:
+            self._image_cache_bytes -= old[3]
+
+        self._image_cache[url] = (img, etag, last_modified, nbytes)
+        self._image_cache_bytes += nbytes
+
+        while self._image_cache_bytes > self.IMAGE_CACHE_MAX_BYTES:
+            _, evicted = self._image_cache.popitem(last=False)
+            self._image_cache_bytes -= evicted[3]
+
+    async def _load_shared_image(self, image_source: str) -> Image.Image:
+        """Load a source image, joining any identical load already in flight.
+
+        Concurrent compose-format calls for the same background (e.g. an agent
+        trying several copy variants at once) fetch and decode it only once.
+        Each caller gets its own copy to draw on.
+        """
+        task = self._pending_loads.get(image_source)
+        if task is None:
+            task = asyncio.ensure_future(self._load_image(image_source))
+            self._pending_loads[image_source] = task
+            task.add_done_callback(lambda _: self._pending_loads.pop(image_source, None))
+
+        # Shield so one cancelled request does not abort the load for the others
+        img = await asyncio.shield(task)
+        return img.copy()
+
     async def batch_compose(
         self,
         image_source: str,
@@ -367,37 +704,41 @@ class ImageCompositor:
         """Compose multiple text variations on the same base image."""
         results = []
         try:
-            # 1. Load the source image ONCE
+            # 1. Load the source image ONCE, fitted to the output size, so each
+            # variation only copies it instead of re-running the LANCZOS fit
+            target_size = self._target_size(output_size)
             if not image_source or image_source.lower() in ("white", "blank", "none", ""):
-                target_size = self.SIZES.get(output_size, self.SIZES["instagram_square"])
                 base_img = Image.new("RGB", target_size, color="white")
-            elif image_source.startswith("http"):
-                async with httpx.AsyncClient() as client:
-                    response = await client.get(image_source)
-                    response.raise_for_status()
-                    base_img = Image.open(io.BytesIO(response.content))
             else:
-                base_img = Image.open(image_source)
-
-            # 2. Iterate through variations
-            for var in variations:
-                res = await self.compose(
-                    image_source=image_source,
-                    hook_text=var.get("hook_text", ""),
-                    body_text=var.get("body_text", ""),
-                    cta_text=var.get("cta_text", ""),
-                    output_size=output_size,
-                    font_name=font_name,
-                    text_color=text_color,
-                    outline_color=outline_color,
-                    _preloaded_image=base_img.copy(),
-                    **kwargs
-                )
+                base_img = await self._load_image(image_source)
+                if base_img.size != target_size:
+                    base_img = await _run_in_pool(self._resize_and_crop, base_img, target_size)
+
+            # 2. Compose variations concurrently, so one variation's upload
+            # overlaps the next one's render instead of queueing behind it
+            semaphore = asyncio.Semaphore(self.BATCH_CONCURRENCY)
+
+            async def _one(var: dict) -> dict:
+                async with semaphore:
+                    return await self.compose(
+                        image_source=image_source,
+                        hook_text=var.get("hook_text", ""),
+                        body_text=var.get("body_text", ""),
+                        cta_text=var.get("cta_text", ""),
+                        output_size=output_size,
+                        font_name=font_name,
+                        text_color=text_color,
+                        outline_color=outline_color,
+                        _preloaded_image=base_img.copy(),
+                        **kwargs
+                    )
+
+            for res in await asyncio.gather(*(_one(var) for var in variations)):
                 if res.get("success"):
                     results.append(res["url"])
             return results
-        except Exception as e:
-            print(f"Batch composition error: {e}")
+        except Exception:
+            logger.exception("Batch composition failed")
             return []
 
     async def compose(
@@ -421,118 +762,325 @@ class ImageCompositor:
         cta_style: str = "text",
         cta_button_color: str = "auto",
         safe_zone: str = "auto",
+        output_format: str = "png",  # "png", "jpeg" or "webp"
         _preloaded_image: Image.Image | None = None,
     ) -> dict:
         """
         Compose an ad image with text overlays.
         """
+        if output_format not in self.OUTPUT_FORMATS:
+            return {
+                "success": False,
+                "error": f"Invalid output_format '{output_format}'. Valid: {', '.join(self.OUTPUT_FORMATS)}",
+            }
+
         try:
             # Get target size
-            target_size = self.SIZES.get(output_size, self.SIZES["instagram_square"])
+            target_size = self._target_size(output_size)
+
+            # Check if this is a white/blank background (no AI image with faces)
+            is_white_bg = not image_source or image_source.lower() in ("white", "blank", "none", "")
 
             img = _preloaded_image
+            # Emoji images come from the async client here, not from a render thread
+            prefetch = self._prefetch_emojis(
+                hook_text, body_text, cta_text, "👇" if cta_emoji and cta_text else ""
+            )
 
-            if img is None:
-                # Load the source image or create white background
-                if not image_source or image_source.lower() in ("white", "blank", "none", ""):
+            if img is None and not is_white_bg:
+                # Measure the copy while the download is in flight; the
+                # render below then finds fonts and line wraps cached
+                img, _, _ = await asyncio.gather(
+                    self._load_shared_image(image_source),
+                    _run_in_pool(
+                        self._prepare_text_layout,
+                        hook_text, body_text, cta_text, output_size, safe_zone, bold_hook, cta_emoji,
+                    ),
+                    prefetch,
+                )
+            else:
+                if img is None:
                     # Create white background
                     img = Image.new("RGB", target_size, color="white")
-                elif image_source.startswith("http"):
-                    async with httpx.AsyncClient() as client:
-                        response = await client.get(image_source)
-                        response.raise_for_status()
-                        img = Image.open(io.BytesIO(response.content))
+                await prefetch
+
+            # Pillow work runs on the render pool so the event loop stays free
+            image_bytes = await _run_in_pool(
+                self._render_compose,
+                img,
+                is_white_bg=is_white_bg,
+                hook_text=hook_text,
+                body_text=body_text,
+                cta_text=cta_text,
+                output_size=output_size,
+                text_color=text_color,
+                outline_color=outline_color,
+                outline_width=outline_width,
+                cta_emoji=cta_emoji,
+                bold_hook=bold_hook,
+                cta_style=cta_style,
+                cta_button_color=cta_button_color,
+                safe_zone=safe_zone,
+                output_format=output_format,
+            )
+
+            # Save via storage service
+            filename, url = await self.storage.save(
+                data=image_bytes,
+                content_type=self.OUTPUT_FORMATS[output_format][2],
+                folder="composed",
+            )
+
+            width, height = target_size
+            return {
+                "success": True,
+                "url": url,
+                "filename": filename,
+                "size": f"{width}x{height}",
+            }
+
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Composition failed: {str(e)}",
+            }
+
+    def _prepare_text_layout(
+        self,
+        hook_text: str,
+        body_text: str,
+        cta_text: str,
+        output_size: str,
+        safe_zone: str,
+        bold_hook: bool,
+        cta_emoji: bool,
+    ) -> None:
+        """Load fonts and wrap each block at its starting size, which needs no
+        pixels. Only warms the font and measurement caches _render_compose uses."""
+        width, _ = self._target_size(output_size)
+        margins = self._get_safe_zone(output_size, safe_zone)
+        max_text_width = width - margins["left"] - margins["right"]
+        if cta_emoji and cta_text:
+            cta_text = f"{cta_text} 👇"
+
+        for text, font_name in (
+            ((hook_text or "").upper(), self.COMPOSE_BOLD_FONT if bold_hook else self.COMPOSE_REGULAR_FONT),
+            (body_text, self.COMPOSE_REGULAR_FONT),
+            ((cta_text or "").upper(), self.COMPOSE_REGULAR_FONT),
+        ):
+            if text:
+                font = self._find_font(font_name, self.COMPOSE_FONT_SIZE, text=text)
+                self._line_heights(font, self._wrap_text(text, font, max_text_width))
+
+    def _render_compose(
+        self,
+        img: Image.Image,
+        is_white_bg: bool,
+        hook_text: str,
+        body_text: str,
+        cta_text: str,
+        output_size: str,
+        text_color: str,
+        outline_color: str,
+        outline_width: int,
+        cta_emoji: bool,
+        bold_hook: bool,
+        cta_style: str,
+        cta_button_color: str,
+        safe_zone: str,
+        output_format: str = "png",
+    ) -> bytes:
+        """Draw the compose() layout onto img and return encoded bytes (pure Pillow, runs in the pool)."""
+        target_size = self._target_size(output_size)
+
+        # Resize image to fit target, maintaining aspect ratio and cropping
+        if img.size != target_size:
+            img = self._resize_and_crop(img, target_size)
+
+        # Create drawing context
+        draw = ImageDraw.Draw(img)
+        width, height = img.size
+
+        # Get safe zone margins (replaces fixed padding)
+        margins = self._get_safe_zone(output_size, safe_zone)
+        left_margin = margins["left"]
+        right_margin = margins["right"]
+        top_margin = margins["top"]
+        bottom_margin = margins["bottom"]
+
+        max_text_width = width - left_margin - right_margin
+
+        # Define safe zones - top 40% and bottom 40% of image
+        # This leaves the middle 20% clear for faces/subjects (reduced gap)
+        top_zone_height = int(height * 0.40) - top_margin
+        bottom_zone_height = int(height * 0.40) - bottom_margin
+        bottom_zone_start = int(height * 0.60)
+
+        # Font sizes - all same size (bold hook will look slightly larger naturally)
+        HOOK_SIZE = self.COMPOSE_FONT_SIZE
+        BODY_SIZE = self.COMPOSE_FONT_SIZE
+        CTA_SIZE = self.COMPOSE_FONT_SIZE
+        MIN_FONT_SIZE = 28
+
+        # Font selection: bold for hook (if enabled), regular for body/CTA
+        hook_font_name = self.COMPOSE_BOLD_FONT if bold_hook else self.COMPOSE_REGULAR_FONT
+        body_font_name = self.COMPOSE_REGULAR_FONT
+        cta_font_name = self.COMPOSE_REGULAR_FONT
+
+        # Add emoji to CTA if enabled
+        if cta_emoji and cta_text:
+            cta_text = f"{cta_text} 👇"
+
+        # Hook and CTA render uppercase; case them once, not per size probe
+        hook_upper = (hook_text or "").upper()
+        cta_upper = (cta_text or "").upper()
+
+        if is_white_bg:
+            # === WHITE BACKGROUND: Even distribution of all text blocks ===
+            # Calculate heights for all blocks first, then distribute evenly
+
+            all_blocks = []  # [(lines, font, block_height), ...]
+
+            # Hook block (bold if enabled, uppercase)
+            if hook_text:
+                hook_font = self._find_font(hook_font_name, HOOK_SIZE, text=hook_text)
+                hook_lines = self._wrap_text(hook_upper, hook_font, max_text_width)
+                hook_heights = self._line_heights(hook_font, hook_lines)
+                hook_height = sum(h + 6 for h in hook_heights)
+                all_blocks.append(("hook", hook_lines, hook_heights, hook_font, hook_height, 6))
+
+            # Body block (regular font, normal case)
+            if body_text:
+                body_font = self._find_font(body_font_name, BODY_SIZE, text=body_text)
+                body_lines = self._wrap_text(body_text, body_font, max_text_width)
+                body_heights = self._line_heights(body_font, body_lines)
+                body_height = sum(h + 8 for h in body_heights)
+                all_blocks.append(("body", body_lines, body_heights, body_font, body_height, 8))
+
+            # CTA block (regular font, uppercase)
+            if cta_text:
+                cta_font = self._find_font(cta_font_name, CTA_SIZE, text=cta_text)
+                cta_lines = self._wrap_text(cta_upper, cta_font, max_text_width)
+                cta_heights = self._line_heights(cta_font, cta_lines)
+                if cta_style == "button":
+                    # Button needs extra height for padding
+                    cta_height = text_bbox(cta_font, cta_text)[3] + 50
                 else:
-                    img = Image.open(image_source)
-
-            # Resize image to fit target, maintaining aspect ratio and cropping
-            if img.size != target_size:
-                img = self._resize_and_crop(img, target_size)
-
-            # Create drawing context
-            draw = ImageDraw.Draw(img)
-            width, height = img.size
-
-            # Get safe zone margins (replaces fixed padding)
-            margins = self._get_safe_zone(output_size, safe_zone)
-            left_margin = margins["left"]
-            right_margin = margins["right"]
-            top_margin = margins["top"]
-            bottom_margin = margins["bottom"]
-
-            max_text_width = width - left_margin - right_margin
-
-            # Define safe zones - top 40% and bottom 40% of image
-            # This leaves the middle 20% clear for faces/subjects (reduced gap)
-            top_zone_height = int(height * 0.40) - top_margin
-            bottom_zone_height = int(height * 0.40) - bottom_margin
-            bottom_zone_start = int(height * 0.60)
-
-            # Font sizes - all same size (bold hook will look slightly larger naturally)
-            HOOK_SIZE = 65
-            BODY_SIZE = 65
-            CTA_SIZE = 65
-            MIN_FONT_SIZE = 28
-
-            # Font selection: bold for hook (if enabled), regular for body/CTA
-            bold_font = "impact"  # Bold font for hook
-            regular_font = "liberation"  # Regular font for body/CTA
-            hook_font_name = bold_font if bold_hook else regular_font
-            body_font_name = regular_font
-            cta_font_name = regular_font
-
-            # Add emoji to CTA if enabled
-            if cta_emoji and cta_text:
-                cta_text = f"{cta_text} 👇"
+                    cta_height = sum(h + 6 for h in cta_heights)
+                all_blocks.append(("cta", cta_lines, cta_heights, cta_font, cta_height, 6))
 
-            # Check if this is a white/blank background (no AI image with faces)
-            is_white_bg = not image_source or image_source.lower() in ("white", "blank", "none", "")
+            # Calculate total text height and remaining space
+            total_text_height = sum(block[4] for block in all_blocks)
 
-            if is_white_bg:
-                # === WHITE BACKGROUND: Even distribution of all text blocks ===
-                # Calculate heights for all blocks first, then distribute evenly
-
-                all_blocks = []  # [(lines, font, block_height), ...]
-
-                # Hook block (bold if enabled, uppercase)
-                if hook_text:
-                    hook_font = self._find_font(hook_font_name, HOOK_SIZE, text=hook_text)
-                    hook_lines = self._wrap_text(hook_text.upper(), hook_font, max_text_width)
-                    hook_height = sum(hook_font.getbbox(line)[3] - hook_font.getbbox(line)[1] + 6 for line in hook_lines)
-                    all_blocks.append(("hook", hook_lines, hook_font, hook_height, 6))
-
-                # Body block (regular font, normal case)
-                if body_text:
-                    body_font = self._find_font(body_font_name, BODY_SIZE, text=body_text)
-                    body_lines = self._wrap_text(body_text, body_font, max_text_width)
-                    body_height = sum(body_font.getbbox(line)[3] - body_font.getbbox(line)[1] + 8 for line in body_lines)
-                    all_blocks.append(("body", body_lines, body_font, body_height, 8))
-
-                # CTA block (regular font, uppercase)
-                if cta_text:
-                    cta_font = self._find_font(cta_font_name, CTA_SIZE, text=cta_text)
-                    cta_lines = self._wrap_text(cta_text.upper(), cta_font, max_text_width)
-                    if cta_style == "button":
-                        # Button needs extra height for padding
-                        cta_height = cta_font.getbbox(cta_text)[3] + 50
-                    else:
-                        cta_height = sum(cta_font.getbbox(line)[3] - cta_font.getbbox(line)[1] + 6 for line in cta_lines)
-                    all_blocks.append(("cta", cta_lines, cta_font, cta_height, 6))
+            # Fixed gap between blocks (70px) - centered vertically
+            gap_size = 70
+            num_gaps = max(1, len(all_blocks) - 1)
+            total_content_height = total_text_height + (gap_size * num_gaps)
 
-                # Calculate total text height and remaining space
-                total_text_height = sum(block[3] for block in all_blocks)
+            # Determine button color for CTA
+            btn_color = "#FF5722" if cta_button_color == "auto" else cta_button_color
 
-                # Fixed gap between blocks (70px) - centered vertically
-                gap_size = 70
-                num_gaps = max(1, len(all_blocks) - 1)
-                total_content_height = total_text_height + (gap_size * num_gaps)
+            # Center content vertically
+            y_offset = (height - total_content_height) // 2
+            for i, (block_type, lines, line_heights, font, block_height, line_spacing) in enumerate(all_blocks):
+                if block_type == "cta" and cta_style == "button":
+                    # Draw CTA as button
+                    y_offset = self._draw_cta_button(
+                        img, draw, lines[0], width // 2, y_offset,
+                        font, button_color=btn_color, text_color="white"
+                    )
+                else:
+                    for line, line_height in zip(lines, line_heights):
+                        text_width = self._measure_text_mixed(line, font)
+                        x = (width - text_width) // 2
 
-                # Determine button color for CTA
-                btn_color = "#FF5722" if cta_button_color == "auto" else cta_button_color
+                        self._draw_text_with_outline_mixed(
+                            img,
+                            draw,
+                            (x, y_offset),
+                            line,
+                            font,
+                            fill=text_color,
+                            outline=outline_color,
+                            outline_width=outline_width,
+                        )
+                        y_offset += line_height + line_spacing
 
-                # Center content vertically
-                y_offset = (height - total_content_height) // 2
-                for i, (block_type, lines, font, block_height, line_spacing) in enumerate(all_blocks):
+                # Add gap after block (except last one)
+                if i < len(all_blocks) - 1:
+                    y_offset += gap_size
+
+        else:
+            # === AI BACKGROUND: Hook at top, body+CTA at bottom (smaller gap in middle) ===
+
+            # Draw hook text at top (bold if enabled)
+            if hook_text:
+                hook_font = self._find_font(hook_font_name, HOOK_SIZE, text=hook_text)
+                hook_lines = self._wrap_text(hook_upper, hook_font, max_text_width)
+
+                y_offset = top_margin
+                for line in hook_lines:
+                    bbox = text_bbox(hook_font, line)
+                    text_width = bbox[2] - bbox[0]
+                    x = (width - text_width) // 2
+
+                    self._draw_text_with_outline(
+                        draw, (x, y_offset), line, hook_font,
+                        fill=text_color, outline=outline_color, outline_width=outline_width
+                    )
+                    y_offset += bbox[3] - bbox[1] + 8
+
+            # Body and CTA at bottom (regular font)
+            max_bottom_y = height - bottom_margin
+            min_body_y = bottom_zone_start
+
+            if body_text or cta_text:
+                def measure_bottom(body_size: int) -> tuple[list, int]:
+                    text_blocks = []
+                    total_height = 0
+
+                    if body_text:
+                        body_font = self._find_font(body_font_name, body_size, text=body_text)
+                        body_lines = self._wrap_text(body_text, body_font, max_text_width)
+                        body_heights = self._line_heights(body_font, body_lines)
+                        text_blocks.append(("body", body_lines, body_heights, body_font))
+                        total_height += sum(h + 8 for h in body_heights)
+
+                    if cta_text:
+                        cta_size = int(CTA_SIZE * body_size / BODY_SIZE)
+                        cta_font = self._find_font(cta_font_name, max(cta_size, MIN_FONT_SIZE), text=cta_text)
+                        cta_lines = self._wrap_text(cta_upper, cta_font, max_text_width)
+                        cta_heights = self._line_heights(cta_font, cta_lines)
+                        text_blocks.append(("cta", cta_lines, cta_heights, cta_font))
+                        if body_text:
+                            total_height += 25  # Reduced gap between body and CTA
+                        if cta_style == "button":
+                            total_height += text_bbox(cta_font, cta_text)[3] + 50
+                        else:
+                            total_height += sum(h + 8 for h in cta_heights)
+
+                    return text_blocks, total_height
+
+                # Shrink body (and CTA with it) in steps of 3 until the bottom
+                # zone fits. Height only grows with size, so binary-search the
+                # steps instead of trying each one; falls back to the smallest
+                text_blocks, total_height = _largest_fitting(
+                    range(BODY_SIZE, MIN_FONT_SIZE - 1, -3),
+                    measure_bottom,
+                    lambda measured: measured[1] <= (max_bottom_y - min_body_y),
+                )
+
+                y_offset = max_bottom_y - total_height
+                if y_offset < min_body_y:
+                    y_offset = min_body_y
+
+                # Determine button color
+                if cta_button_color == "auto":
+                    btn_color = self._extract_dominant_color(img)
+                else:
+                    btn_color = cta_button_color
+
+                for i, (block_type, lines, line_heights, font) in enumerate(text_blocks):
                     if block_type == "cta" and cta_style == "button":
                         # Draw CTA as button
                         y_offset = self._draw_cta_button(
@@ -540,9 +1088,8 @@ class ImageCompositor:
                             font, button_color=btn_color, text_color="white"
                         )
                     else:
-                        for line in lines:
+                        for line, line_height in zip(lines, line_heights):
                             text_width = self._measure_text_mixed(line, font)
-                            bbox = font.getbbox(line)
                             x = (width - text_width) // 2
 
                             self._draw_text_with_outline_mixed(
@@ -555,158 +1102,22 @@ class ImageCompositor:
                                 outline=outline_color,
                                 outline_width=outline_width,
                             )
-                            y_offset += bbox[3] - bbox[1] + line_spacing
-
-                    # Add gap after block (except last one)
-                    if i < len(all_blocks) - 1:
-                        y_offset += gap_size
-
-            else:
-                # === AI BACKGROUND: Hook at top, body+CTA at bottom (smaller gap in middle) ===
-
-                # Draw hook text at top (bold if enabled)
-                if hook_text:
-                    hook_font = self._find_font(hook_font_name, HOOK_SIZE, text=hook_text)
-                    hook_lines = self._wrap_text(hook_text.upper(), hook_font, max_text_width)
-
-                    y_offset = top_margin
-                    for line in hook_lines:
-                        text_width = hook_font.getbbox(line)[2] - hook_font.getbbox(line)[0]
-                        bbox = hook_font.getbbox(line)
-                        x = (width - text_width) // 2
-
-                        self._draw_text_with_outline(
-                            draw, (x, y_offset), line, hook_font,
-                            fill=text_color, outline=outline_color, outline_width=outline_width
-                        )
-                        y_offset += bbox[3] - bbox[1] + 8
-
-                # Body and CTA at bottom (regular font)
-                max_bottom_y = height - bottom_margin
-                min_body_y = bottom_zone_start
-
-                if body_text or cta_text:
-                    current_body_size = BODY_SIZE
-
-                    while current_body_size >= MIN_FONT_SIZE:
-                        text_blocks = []
-                        total_height = 0
-
-                        if body_text:
-                            body_font = self._find_font(body_font_name, current_body_size, text=body_text)
-                            body_lines = self._wrap_text(body_text, body_font, max_text_width)
-                            text_blocks.append(("body", body_lines, body_font))
-                            for line in body_lines:
-                                bbox = body_font.getbbox(line)
-                                total_height += bbox[3] - bbox[1] + 8
-
-                        if cta_text:
-                            cta_size = int(CTA_SIZE * current_body_size / BODY_SIZE)
-                            cta_font = self._find_font(cta_font_name, max(cta_size, MIN_FONT_SIZE), text=cta_text)
-                            cta_lines = self._wrap_text(cta_text.upper(), cta_font, max_text_width)
-                            text_blocks.append(("cta", cta_lines, cta_font))
-                            if body_text:
-                                total_height += 25  # Reduced gap between body and CTA
-                            if cta_style == "button":
-                                total_height += cta_font.getbbox(cta_text)[3] + 50
-                            else:
-                                for line in cta_lines:
-                                    bbox = cta_font.getbbox(line)
-                                    total_height += bbox[3] - bbox[1] + 8
-
-                        if total_height <= (max_bottom_y - min_body_y):
-                            break
-                        current_body_size -= 3
-
-                    y_offset = max_bottom_y - total_height
-                    if y_offset < min_body_y:
-                        y_offset = min_body_y
-
-                    # Determine button color
-                    if cta_button_color == "auto":
-                        btn_color = self._extract_dominant_color(img)
-                    else:
-                        btn_color = cta_button_color
+                            y_offset += line_height + 8
+                    if i < len(text_blocks) - 1:
+                        y_offset += 25  # Reduced gap
 
-                    for i, (block_type, lines, font) in enumerate(text_blocks):
-                        if block_type == "cta" and cta_style == "button":
-                            # Draw CTA as button
-                            y_offset = self._draw_cta_button(
-                                img, draw, lines[0], width // 2, y_offset,
-                                font, button_color=btn_color, text_color="white"
-                            )
-                        else:
-                            for line in lines:
-                                text_width = self._measure_text_mixed(line, font)
-                                bbox = font.getbbox(line)
-                                x = (width - text_width) // 2
-
-                                self._draw_text_with_outline_mixed(
-                                    img,
-                                    draw,
-                                    (x, y_offset),
-                                    line,
-                                    font,
-                                    fill=text_color,
-                                    outline=outline_color,
-                                    outline_width=outline_width,
-                                )
-                                y_offset += bbox[3] - bbox[1] + 8
-                        if i < len(text_blocks) - 1:
-                            y_offset += 25  # Reduced gap
-
-            # Save to bytes
-            output = io.BytesIO()
-            img.save(output, format="PNG", quality=95)
-            output.seek(0)
 
-            # Save via storage service
-            filename, url = await self.storage.save(
-                data=output.getvalue(),
-                content_type="image/png",
-                folder="composed",
-            )
-
-            return {
-                "success": True,
-                "url": url,
-                "filename": filename,
-                "size": f"{width}x{height}",
-            }
-
-        except Exception as e:
-            return {
-                "success": False,
-                "error": f"Composition failed: {str(e)}",
-            }
+        # Save to bytes
+        image_format, save_options, _ = self.OUTPUT_FORMATS[output_format]
+        if image_format == "JPEG" and img.mode not in ("RGB", "L"):
+            img = img.convert("RGB")
+        output = io.BytesIO()
+        img.save(output, format=image_format, **save_options)
+        return output.getvalue()
 
     def _resize_and_crop(self, img: Image.Image, target_size: tuple[int, int]) -> Image.Image:
         """Resize and crop image to exactly fit target size."""
-        target_w, target_h = target_size
-        target_ratio = target_w / target_h
-
-        img_w, img_h = img.size
-        img_ratio = img_w / img_h
-
-        # Resize to cover target size
-        if img_ratio > target_ratio:
-            # Image is wider - fit height, crop width
-            new_h = target_h
-            new_w = int(img_w * (target_h / img_h))
-        else:
-            # Image is taller - fit width, crop height
-            new_w = target_w
-            new_h = int(img_h * (target_w / img_w))
-
-        img = img.resize((new_w, new_h), Image.Resampling.LANCZOS)
-
-        # Crop to center
-        left = (new_w - target_w) // 2
-        top = (new_h - target_h) // 2
-        right = left + target_w
-        bottom = top + target_h
-
-        return img.crop((left, top, right, bottom))
+        return fit_to_size(img, target_size)
 
     def _draw_rounded_rectangle(
         self,
@@ -716,17 +1127,7 @@ class ImageCompositor:
         fill: str,
     ):
         """Draw a rounded rectangle."""
-        x1, y1, x2, y2 = xy
-
-        # Draw main rectangle
-        draw.rectangle([x1 + radius, y1, x2 - radius, y2], fill=fill)
-        draw.rectangle([x1, y1 + radius, x2, y2 - radius], fill=fill)
-
-        # Draw four corners
-        draw.pieslice([x1, y1, x1 + radius * 2, y1 + radius * 2], 180, 270, fill=fill)
-        draw.pieslice([x2 - radius * 2, y1, x2, y1 + radius * 2], 270, 360, fill=fill)
-        draw.pieslice([x1, y2 - radius * 2, x1 + radius * 2, y2], 90, 180, fill=fill)
-        draw.pieslice([x2 - radius * 2, y2 - radius * 2, x2, y2], 0, 90, fill=fill)
+        draw.rounded_rectangle(xy, radius=radius, fill=fill)
 
     def _draw_cta_button(
         self,
@@ -747,7 +1148,7 @@ class ImageCompositor:
         Returns the bottom y coordinate of the button.
         """
         # Measure text
-        bbox = font.getbbox(text)
+        bbox = text_bbox(font, text)
         text_width = bbox[2] - bbox[0]
         text_height = bbox[3] - bbox[1]
 
@@ -776,6 +1177,10 @@ class ImageCompositor:
 
         return button_y2
 
+    def _target_size(self, output_size: str) -> tuple[int, int]:
+        """Resolve an output_size preset to (width, height); unknown names fall back to square."""
+        return self.SIZES.get(output_size, self._DEFAULT_SIZE)
+
     def _get_safe_zone(self, output_size: str, safe_zone: str = "auto") -> dict:
         """Get safe zone margins for the given output size."""
         if safe_zone == "auto":
@@ -823,6 +1228,7 @@ class ImageCompositor:
         cta_style: str = "text",
         cta_button_color: str = "auto",
         safe_zone: str = "auto",
+        _preloaded_image: Image.Image | None = None,
     ) -> dict:
         """
         Compose a split-screen ad: image on left, text on colored background on right.
@@ -830,137 +1236,39 @@ class ImageCompositor:
         """
         try:
             # Get target size
-            target_size = self.SIZES.get(output_size, self.SIZES["instagram_square"])
+            target_size = self._target_size(output_size)
             width, height = target_size
 
-            # Create base canvas with right side color
-            canvas = Image.new("RGB", target_size, color=right_bg_color)
-            draw = ImageDraw.Draw(canvas)
+            prefetch = self._prefetch_emojis(hook_text, body_text, cta_text)
 
-            # Load and process the source image
-            if image_source and image_source.startswith("http"):
-                async with httpx.AsyncClient() as client:
-                    response = await client.get(image_source)
-                    response.raise_for_status()
-                    src_img = Image.open(io.BytesIO(response.content))
+            # Load the source image
+            if _preloaded_image is not None:
+                src_img = _preloaded_image
+                await prefetch
             elif image_source:
-                src_img = Image.open(image_source)
+                src_img, _ = await asyncio.gather(self._load_shared_image(image_source), prefetch)
             else:
                 # No image - use a gradient or solid color on left
                 src_img = Image.new("RGB", (width // 2, height), color="#4A90E2")
+                await prefetch
 
-            # Calculate split point (50% width)
-            split_x = width // 2
-
-            # Calculate angle offset for the divider
-            angle_rad = math.radians(divider_angle)
-            angle_offset = int(math.tan(angle_rad) * height / 2)
-
-            # Resize source image to fit left half (with extra for angle)
-            left_width = split_x + angle_offset + 20
-            src_img = self._resize_and_crop(src_img, (left_width, height))
-
-            # Create a mask for the angled edge (same size as src_img)
-            mask = Image.new("L", (left_width, height), 255)
-            mask_draw = ImageDraw.Draw(mask)
-
-            # Draw the angled right edge by making it transparent
-            # Create a polygon for the part to make transparent (right side)
-            polygon = [
-                (split_x + angle_offset, 0),  # Top of angle
-                (left_width, 0),  # Top-right
-                (left_width, height),  # Bottom-right
-                (split_x - angle_offset, height),  # Bottom of angle
-            ]
-            mask_draw.polygon(polygon, fill=0)
-
-            # Paste source image with mask
-            canvas.paste(src_img, (0, 0), mask)
-
-            # Get safe zone margins
-            margins = self._get_safe_zone(output_size, safe_zone)
-
-            # Text area is the right half
-            text_area_left = split_x + 20
-            text_area_right = width - margins["right"]
-            text_area_width = text_area_right - text_area_left
-
-            # Determine text/outline colors based on background
-            if right_bg_color.lower() in ("white", "#ffffff", "#fff"):
-                actual_text_color = "black"
-                outline_color = "white"
-            else:
-                actual_text_color = text_color if text_color != "auto" else "white"
-                outline_color = "black" if actual_text_color == "white" else "white"
-
-            # Font sizes - all same
-            HOOK_SIZE = 65
-            BODY_SIZE = 65
-            CTA_SIZE = 65
-            MIN_SIZE = 28
-
-            # Calculate text positioning - center vertically in right half
-            all_blocks = []
-
-            if hook_text:
-                hook_font = self._find_font("impact", HOOK_SIZE)
-                hook_lines = self._wrap_text(hook_text.upper(), hook_font, text_area_width)
-                hook_height = sum(hook_font.getbbox(line)[3] - hook_font.getbbox(line)[1] + 8 for line in hook_lines)
-                all_blocks.append(("hook", hook_lines, hook_font, hook_height))
-
-            if body_text:
-                body_font = self._find_font("liberation", BODY_SIZE)
-                body_lines = self._wrap_text(body_text, body_font, text_area_width)
-                body_height = sum(body_font.getbbox(line)[3] - body_font.getbbox(line)[1] + 8 for line in body_lines)
-                all_blocks.append(("body", body_lines, body_font, body_height))
-
-            if cta_text:
-                cta_font = self._find_font("liberation", CTA_SIZE)
-                cta_lines = [cta_text.upper()]
-                cta_height = cta_font.getbbox(cta_text)[3] + 40 if cta_style == "button" else cta_font.getbbox(cta_text)[3]
-                all_blocks.append(("cta", cta_lines, cta_font, cta_height))
-
-            # Calculate total height and starting Y
-            total_height = sum(block[3] for block in all_blocks) + (len(all_blocks) - 1) * 30
-            start_y = max(margins["top"], (height - total_height) // 2)
-
-            # Draw text blocks
-            y_offset = start_y
-            text_center_x = text_area_left + (text_area_width // 2)
-
-            for block_type, lines, font, block_height in all_blocks:
-                for line in lines:
-                    text_width = self._measure_text_mixed(line, font)
-                    x = text_center_x - (text_width // 2)
-
-                    if block_type == "cta" and cta_style == "button":
-                        # Determine button color
-                        if cta_button_color == "auto":
-                            btn_color = self._extract_dominant_color(src_img)
-                        else:
-                            btn_color = cta_button_color
-
-                        y_offset = self._draw_cta_button(
-                            canvas, draw, line, text_center_x, y_offset,
-                            font, button_color=btn_color, text_color="white"
-                        )
-                    else:
-                        self._draw_text_with_outline_mixed(
-                            canvas, draw, (x, y_offset), line, font,
-                            fill=actual_text_color, outline=outline_color, outline_width=2
-                        )
-                        bbox = font.getbbox(line)
-                        y_offset += bbox[3] - bbox[1] + 8
-
-                y_offset += 30  # Gap between blocks
-
-            # Save
-            output = io.BytesIO()
-            canvas.save(output, format="PNG", quality=95)
-            output.seek(0)
+            png_bytes = await _run_in_pool(
+                self._render_split,
+                src_img,
+                hook_text=hook_text,
+                body_text=body_text,
+                cta_text=cta_text,
+                output_size=output_size,
+                right_bg_color=right_bg_color,
+                divider_angle=divider_angle,
+                text_color=text_color,
+                cta_style=cta_style,
+                cta_button_color=cta_button_color,
+                safe_zone=safe_zone,
+            )
 
             filename, url = await self.storage.save(
-                data=output.getvalue(),
+                data=png_bytes,
                 content_type="image/png",
                 folder="composed",
             )
@@ -979,6 +1287,139 @@ class ImageCompositor:
                 "error": f"Split composition failed: {str(e)}",
             }
 
+    def _render_split(
+        self,
+        src_img: Image.Image,
+        hook_text: str,
+        body_text: str,
+        cta_text: str,
+        output_size: str,
+        right_bg_color: str,
+        divider_angle: int,
+        text_color: str,
+        cta_style: str,
+        cta_button_color: str,
+        safe_zone: str,
+    ) -> bytes:
+        """Draw the split-screen layout and return PNG bytes (pure Pillow, runs in the pool)."""
+        target_size = self._target_size(output_size)
+        width, height = target_size
+
+        # Create base canvas with right side color
+        canvas = Image.new("RGB", target_size, color=right_bg_color)
+        draw = ImageDraw.Draw(canvas)
+
+        # Calculate split point (50% width)
+        split_x = width // 2
+
+        # Calculate angle offset for the divider
+        angle_rad = math.radians(divider_angle)
+        angle_offset = int(math.tan(angle_rad) * height / 2)
+
+        # Resize source image to fit left half (with extra for angle)
+        left_width = split_x + angle_offset + 20
+        if src_img.size != (left_width, height):
+            src_img = self._resize_and_crop(src_img, (left_width, height))
+
+        # Create a mask for the angled edge (same size as src_img)
+        mask = Image.new("L", (left_width, height), 255)
+        mask_draw = ImageDraw.Draw(mask)
+
+        # Draw the angled right edge by making it transparent
+        # Create a polygon for the part to make transparent (right side)
+        polygon = [
+            (split_x + angle_offset, 0),  # Top of angle
+            (left_width, 0),  # Top-right
+            (left_width, height),  # Bottom-right
+            (split_x - angle_offset, height),  # Bottom of angle
+        ]
+        mask_draw.polygon(polygon, fill=0)
+
+        # Paste source image with mask
+        canvas.paste(src_img, (0, 0), mask)
+
+        # Get safe zone margins
+        margins = self._get_safe_zone(output_size, safe_zone)
+
+        # Text area is the right half
+        text_area_left = split_x + 20
+        text_area_right = width - margins["right"]
+        text_area_width = text_area_right - text_area_left
+
+        # Determine text/outline colors based on background
+        if right_bg_color.lower() in ("white", "#ffffff", "#fff"):
+            actual_text_color = "black"
+            outline_color = "white"
+        else:
+            actual_text_color = text_color if text_color != "auto" else "white"
+            outline_color = "black" if actual_text_color == "white" else "white"
+
+        # Font sizes - all same
+        HOOK_SIZE = 65
+        BODY_SIZE = 65
+        CTA_SIZE = 65
+        MIN_SIZE = 28
+
+        # Calculate text positioning - center vertically in right half
+        all_blocks = []
+
+        if hook_text:
+            hook_font = self._find_font("impact", HOOK_SIZE)
+            hook_lines = self._wrap_text(hook_text.upper(), hook_font, text_area_width)
+            hook_height = sum(text_bbox(hook_font, line)[3] - text_bbox(hook_font, line)[1] + 8 for line in hook_lines)
+            all_blocks.append(("hook", hook_lines, hook_font, hook_height))
+
+        if body_text:
+            body_font = self._find_font("liberation", BODY_SIZE)
+            body_lines = self._wrap_text(body_text, body_font, text_area_width)
+            body_height = sum(text_bbox(body_font, line)[3] - text_bbox(body_font, line)[1] + 8 for line in body_lines)
+            all_blocks.append(("body", body_lines, body_font, body_height))
+
+        if cta_text:
+            cta_font = self._find_font("liberation", CTA_SIZE)
+            cta_lines = [cta_text.upper()]
+            cta_height = text_bbox(cta_font, cta_text)[3] + 40 if cta_style == "button" else text_bbox(cta_font, cta_text)[3]
+            all_blocks.append(("cta", cta_lines, cta_font, cta_height))
+
+        # Calculate total height and starting Y
+        total_height = sum(block[3] for block in all_blocks) + (len(all_blocks) - 1) * 30
+        start_y = max(margins["top"], (height - total_height) // 2)
+
+        # Draw text blocks
+        y_offset = start_y
+        text_center_x = text_area_left + (text_area_width // 2)
+
+        for block_type, lines, font, block_height in all_blocks:
+            for line in lines:
+                text_width = self._measure_text_mixed(line, font)
+                x = text_center_x - (text_width // 2)
+
+                if block_type == "cta" and cta_style == "button":
+                    # Determine button color
+                    if cta_button_color == "auto":
+                        btn_color = self._extract_dominant_color(src_img)
+                    else:
+                        btn_color = cta_button_color
+
+                    y_offset = self._draw_cta_button(
+                        canvas, draw, line, text_center_x, y_offset,
+                        font, button_color=btn_color, text_color="white"
+                    )
+                else:
+                    self._draw_text_with_outline_mixed(
+                        canvas, draw, (x, y_offset), line, font,
+                        fill=actual_text_color, outline=outline_color, outline_width=2
+                    )
+                    bbox = text_bbox(font, line)
+                    y_offset += bbox[3] - bbox[1] + 8
+
+            y_offset += 30  # Gap between blocks
+
+        # Save
+        output = io.BytesIO()
+        canvas.save(output, format="PNG", compress_level=self.PNG_COMPRESS_LEVEL)
+        return output.getvalue()
+
     async def compose_with_stickers(
         self,
         hook_text: str,
@@ -999,115 +1440,39 @@ class ImageCompositor:
             sticker_urls = sticker_urls or []
 
             # Get target size
-            target_size = self.SIZES.get(output_size, self.SIZES["instagram_square"])
+            target_size = self._target_size(output_size)
             width, height = target_size
 
-            # Create base canvas
-            canvas = Image.new("RGB", target_size, color=bg_color)
-            draw = ImageDraw.Draw(canvas)
-
-            # Get safe zone margins
-            margins = self._get_safe_zone(output_size, safe_zone)
-
-            # Text area
-            text_left = margins["left"]
-            text_right = width - margins["right"]
-            text_width = text_right - text_left
-
-            # Determine colors
-            if bg_color.lower() in ("white", "#ffffff", "#fff"):
-                actual_text_color = "black"
-                outline_color = "white"
-            else:
-                actual_text_color = text_color
-                outline_color = "black" if text_color == "white" else "white"
-
-            # Font sizes - all same
-            HOOK_SIZE = 65
-            BODY_SIZE = 65
-            CTA_SIZE = 65
-
-            # Calculate text layout first
-            all_blocks = []
-
-            if hook_text:
-                hook_font = self._find_font("impact", HOOK_SIZE)
-                hook_lines = self._wrap_text(hook_text.upper(), hook_font, text_width)
-                hook_height = sum(hook_font.getbbox(line)[3] - hook_font.getbbox(line)[1] + 10 for line in hook_lines)
-                all_blocks.append(("hook", hook_lines, hook_font, hook_height))
-
-            if body_text:
-                body_font = self._find_font("liberation", BODY_SIZE)
-                body_lines = self._wrap_text(body_text, body_font, text_width)
-                body_height = sum(body_font.getbbox(line)[3] - body_font.getbbox(line)[1] + 10 for line in body_lines)
-                all_blocks.append(("body", body_lines, body_font, body_height))
-
-            if cta_text:
-                cta_font = self._find_font("liberation", CTA_SIZE)
-                cta_height = cta_font.getbbox(cta_text)[3] + 50 if cta_style == "button" else cta_font.getbbox(cta_text)[3] + 10
-                all_blocks.append(("cta", [cta_text.upper()], cta_font, cta_height))
-
-            # Position text in center
-            total_height = sum(block[3] for block in all_blocks) + (len(all_blocks) - 1) * 40
-            start_y = max(margins["top"], (height - total_height) // 2)
-
-            # Load and place stickers first (so text is on top)
-            sticker_positions = [
-                (margins["left"], margins["top"]),  # Top-left
-                (width - margins["right"] - 150, margins["top"]),  # Top-right
-                (margins["left"], height - margins["bottom"] - 150),  # Bottom-left
-                (width - margins["right"] - 150, height - margins["bottom"] - 150),  # Bottom-right
-            ]
-
-            for i, url in enumerate(sticker_urls[:4]):  # Max 4 stickers
+            # Download stickers up front; None keeps a failed sticker's slot empty
+            async def _fetch_sticker(url: str) -> bytes | None:
                 try:
-                    async with httpx.AsyncClient() as client:
-                        response = await client.get(url, timeout=10.0)
-                        response.raise_for_status()
-                        sticker = Image.open(io.BytesIO(response.content)).convert("RGBA")
-
-                        # Resize sticker to max 150x150
-                        sticker.thumbnail((150, 150), Image.Resampling.LANCZOS)
-
-                        # Get position
-                        pos = sticker_positions[i % len(sticker_positions)]
-
-                        # Paste with alpha
-                        canvas.paste(sticker, pos, sticker)
+                    response = await get_http_client().get(url, timeout=10.0)
+                    response.raise_for_status()
+                    return response.content
                 except Exception:
-                    pass  # Skip failed stickers
-
-            # Draw text
-            y_offset = start_y
-            center_x = width // 2
-
-            for block_type, lines, font, block_height in all_blocks:
-                for line in lines:
-                    text_w = self._measure_text_mixed(line, font)
-                    x = center_x - (text_w // 2)
-
-                    if block_type == "cta" and cta_style == "button":
-                        y_offset = self._draw_cta_button(
-                            canvas, draw, line, center_x, y_offset,
-                            font, button_color=cta_button_color, text_color="white"
-                        )
-                    else:
-                        self._draw_text_with_outline_mixed(
-                            canvas, draw, (x, y_offset), line, font,
-                            fill=actual_text_color, outline=outline_color, outline_width=2
-                        )
-                        bbox = font.getbbox(line)
-                        y_offset += bbox[3] - bbox[1] + 10
+                    return None  # Skip failed stickers
 
-                y_offset += 40
+            *sticker_data, _ = await asyncio.gather(
+                *(_fetch_sticker(url) for url in sticker_urls[:4]),  # Max 4 stickers
+                self._prefetch_emojis(hook_text, body_text, cta_text),
+            )
 
-            # Save
-            output = io.BytesIO()
-            canvas.save(output, format="PNG", quality=95)
-            output.seek(0)
+            png_bytes = await _run_in_pool(
+                self._render_stickers,
+                sticker_data,
+                hook_text=hook_text,
+                body_text=body_text,
+                cta_text=cta_text,
+                output_size=output_size,
+                bg_color=bg_color,
+                text_color=text_color,
+                cta_style=cta_style,
+                cta_button_color=cta_button_color,
+                safe_zone=safe_zone,
+            )
 
             filename, url = await self.storage.save(
-                data=output.getvalue(),
+                data=png_bytes,
                 content_type="image/png",
                 folder="composed",
             )
@@ -1126,6 +1491,126 @@ class ImageCompositor:
                 "error": f"Stickers composition failed: {str(e)}",
             }
 
+    def _render_stickers(
+        self,
+        sticker_data: list[bytes | None],
+        hook_text: str,
+        body_text: str,
+        cta_text: str,
+        output_size: str,
+        bg_color: str,
+        text_color: str,
+        cta_style: str,
+        cta_button_color: str,
+        safe_zone: str,
+    ) -> bytes:
+        """Draw the stickers layout and return PNG bytes (pure Pillow, runs in the pool)."""
+        target_size = self._target_size(output_size)
+        width, height = target_size
+
+        # Create base canvas
+        canvas = Image.new("RGB", target_size, color=bg_color)
+        draw = ImageDraw.Draw(canvas)
+
+        # Get safe zone margins
+        margins = self._get_safe_zone(output_size, safe_zone)
+
+        # Text area
+        text_left = margins["left"]
+        text_right = width - margins["right"]
+        text_width = text_right - text_left
+
+        # Determine colors
+        if bg_color.lower() in ("white", "#ffffff", "#fff"):
+            actual_text_color = "black"
+            outline_color = "white"
+        else:
+            actual_text_color = text_color
+            outline_color = "black" if text_color == "white" else "white"
+
+        # Font sizes - all same
+        HOOK_SIZE = 65
+        BODY_SIZE = 65
+        CTA_SIZE = 65
+
+        # Calculate text layout first
+        all_blocks = []
+
+        if hook_text:
+            hook_font = self._find_font("impact", HOOK_SIZE)
+            hook_lines = self._wrap_text(hook_text.upper(), hook_font, text_width)
+            hook_height = sum(text_bbox(hook_font, line)[3] - text_bbox(hook_font, line)[1] + 10 for line in hook_lines)
+            all_blocks.append(("hook", hook_lines, hook_font, hook_height))
+
+        if body_text:
+            body_font = self._find_font("liberation", BODY_SIZE)
+            body_lines = self._wrap_text(body_text, body_font, text_width)
+            body_height = sum(text_bbox(body_font, line)[3] - text_bbox(body_font, line)[1] + 10 for line in body_lines)
+            all_blocks.append(("body", body_lines, body_font, body_height))
+
+        if cta_text:
+            cta_font = self._find_font("liberation", CTA_SIZE)
+            cta_height = text_bbox(cta_font, cta_text)[3] + 50 if cta_style == "button" else text_bbox(cta_font, cta_text)[3] + 10
+            all_blocks.append(("cta", [cta_text.upper()], cta_font, cta_height))
+
+        # Position text in center
+        total_height = sum(block[3] for block in all_blocks) + (len(all_blocks) - 1) * 40
+        start_y = max(margins["top"], (height - total_height) // 2)
+
+        # Place stickers first (so text is on top)
+        sticker_positions = [
+            (margins["left"], margins["top"]),  # Top-left
+            (width - margins["right"] - 150, margins["top"]),  # Top-right
+            (margins["left"], height - margins["bottom"] - 150),  # Bottom-left
+            (width - margins["right"] - 150, height - margins["bottom"] - 150),  # Bottom-right
+        ]
+
+        for i, data in enumerate(sticker_data):
+            if data is None:
+                continue
+            try:
+                sticker = Image.open(io.BytesIO(data)).convert("RGBA")
+
+                # Resize sticker to max 150x150
+                sticker.thumbnail((150, 150), Image.Resampling.LANCZOS)
+
+                # Get position
+                pos = sticker_positions[i % len(sticker_positions)]
+
+                # Paste with alpha
+                canvas.paste(sticker, pos, sticker)
+            except Exception:
+                pass  # Skip stickers that fail to decode
+
+        # Draw text
+        y_offset = start_y
+        center_x = width // 2
+
+        for block_type, lines, font, block_height in all_blocks:
+            for line in lines:
+                text_w = self._measure_text_mixed(line, font)
+                x = center_x - (text_w // 2)
+
+                if block_type == "cta" and cta_style == "button":
+                    y_offset = self._draw_cta_button(
+                        canvas, draw, line, center_x, y_offset,
+                        font, button_color=cta_button_color, text_color="white"
+                    )
+                else:
+                    self._draw_text_with_outline_mixed(
+                        canvas, draw, (x, y_offset), line, font,
+                        fill=actual_text_color, outline=outline_color, outline_width=2
+                    )
+                    bbox = text_bbox(font, line)
+                    y_offset += bbox[3] - bbox[1] + 10
+
+            y_offset += 40
+
+        # Save
+        output = io.BytesIO()
+        canvas.save(output, format="PNG", compress_level=self.PNG_COMPRESS_LEVEL)
+        return output.getvalue()
+
     async def compose_format(
         self,
         format_type: str = "meme",
@@ -1142,6 +1627,7 @@ class ImageCompositor:
         cta_button_color: str = "auto",
         safe_zone: str = "auto",
         bold_hook: bool = True,
+        base_image: Image.Image | None = None,
     ) -> dict:
         """
         Unified composition method supporting all 4 format types:
@@ -1149,6 +1635,9 @@ class ImageCompositor:
         - meme: AI/uploaded image with text overlay
         - stickers: White background with text and sticker images
         - split: 50/50 split with image left, text right
+
+        base_image: already decoded image_url; skips the fetch+decode when given.
+        It is drawn on in place, so pass a copy if it is shared.
         """
         if format_type == "text_only":
             # For text_only, "auto" defaults to orange since there's no image
@@ -1180,6 +1669,7 @@ class ImageCompositor:
                 cta_style=cta_style,
                 cta_button_color=cta_button_color,
                 safe_zone=safe_zone,
+                _preloaded_image=base_image,
             )
 
         elif format_type == "stickers":
@@ -1210,6 +1700,7 @@ class ImageCompositor:
                 cta_style=cta_style,
                 cta_button_color=cta_button_color,
                 safe_zone=safe_zone,
+                _preloaded_image=base_image,
             )
 
         else:
@@ -1217,3 +1708,158 @@ class ImageCompositor:
                 "success": False,
                 "error": f"Unknown format_type: {format_type}. Use: text_only, meme, stickers, split",
             }
+
+    def _source_fit_size(
+        self, format_type: str, output_size: str, divider_angle: int = 15
+    ) -> tuple[int, int] | None:
+        """Size the source image is cropped to for a format (None if it uses no image)."""
+        target_size = self._target_size(output_size)
+        if format_type == "meme":
+            return target_size
+        if format_type == "split":
+            # Mirrors _render_split: left half plus room for the angled divider
+            width, height = target_size
+            angle_offset = int(math.tan(math.radians(divider_angle)) * height / 2)
+            return (width // 2 + angle_offset + 20, height)
+        return None
+
+    async def batch_compose_format(
+        self,
+        base_image: Image.Image | None,
+        variations: list[dict],
+        format_type: str = "meme",
+        **kwargs,
+    ) -> list[dict]:
+        """
+        Compose every text variation on one already-decoded base image.
+
+        Each variation gets its own copy of base_image, so the source is
+        fetched and decoded once per batch instead of once per variation.
+        Variations render concurrently on the render pool, at most
+        BATCH_CONCURRENCY at a time. Returns one compose_format result dict
+        per variation, in order.
+        """
+        tasks = await self._start_batch(base_image, variations, format_type, **kwargs)
+        return [result for _, result in await asyncio.gather(*tasks)]
+
+    async def iter_batch_compose_format(
+        self,
+        base_image: Image.Image | None,
+        variations: list[dict],
+        format_type: str = "meme",
+        **kwargs,
+    ) -> AsyncIterator[tuple[int, dict]]:
+        """
+        Like batch_compose_format, but yield (index, result) as each variation finishes.
+
+        Results arrive in completion order, not input order. If the consumer
+        stops early, the variations still pending are cancelled.
+        """
+        tasks = await self._start_batch(base_image, variations, format_type, **kwargs)
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def compose_many(self, specs: list[dict], concurrency: int | None = None) -> list[dict]:
+        """
+        Run compose_format for each spec (a dict of its keyword arguments),
+        at most concurrency at a time (default BATCH_CONCURRENCY) across all specs.
+
+        Specs that differ only in their text share one batch: the background
+        is fetched, decoded and fitted once, and each spec draws on a copy.
+        Returns one compose_format result dict per spec, in spec order.
+        """
+        # Group specs by everything but their text; lists (sticker_urls) rule out hashing
+        batches: list[tuple[dict, list[int]]] = []
+        for index, spec in enumerate(specs):
+            shared = {k: v for k, v in spec.items() if k not in ("hook_text", "body_text", "cta_text")}
+            for batch_shared, indices in batches:
+                if batch_shared == shared:
+                    indices.append(index)
+                    break
+            else:
+                batches.append((shared, [index]))
+
+        semaphore = asyncio.Semaphore(concurrency or self.BATCH_CONCURRENCY)
+        results: list[dict | None] = [None] * len(specs)
+
+        async def _run_batch(shared: dict, indices: list[int]) -> None:
+            shared = dict(shared)
+            format_type = shared.pop("format_type", "meme")
+            image_url = shared.get("image_url", "")
+            base_image = None
+            if (
+                format_type in ("meme", "split")
+                and image_url
+                and image_url.lower() not in ("white", "blank", "none")
+            ):
+                try:
+                    base_image = await self._load_shared_image(image_url)
+                except Exception as e:
+                    for index in indices:
+                        results[index] = {"success": False, "error": f"Failed to load image: {str(e)}"}
+                    return
+
+            tasks = await self._start_batch(
+                base_image,
+                [specs[index] for index in indices],
+                format_type,
+                semaphore=semaphore,
+                **shared,
+            )
+            for position, result in await asyncio.gather(*tasks):
+                results[indices[position]] = result
+
+        await asyncio.gather(*(_run_batch(shared, indices) for shared, indices in batches))
+        return results
+
+    async def _start_batch(
+        self,
+        base_image: Image.Image | None,
+        variations: list[dict],
+        format_type: str,
+        semaphore: asyncio.Semaphore | None = None,
+        **kwargs,
+    ) -> list[asyncio.Task]:
+        """Schedule one compose_format task per variation; each resolves to (index, result).
+
+        semaphore bounds the variations in flight; batches sharing one share the bound.
+        """
+        # Fit the source to its final size once, so each variation copies and
+        # draws on output-sized pixels instead of re-running Lanczos on the original
+        fit_size = self._source_fit_size(
+            format_type,
+            kwargs.get("output_size", "instagram_square"),
+            kwargs.get("divider_angle", 15),
+        )
+        if base_image is not None and fit_size and base_image.size != fit_size:
+            base_image = await _run_in_pool(self._resize_and_crop, base_image, fit_size)
+
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.BATCH_CONCURRENCY)
+
+        async def _one(index: int, v: dict) -> tuple[int, dict]:
+            async with semaphore:
+                try:
+                    result = await self.compose_format(
+                        format_type=format_type,
+                        hook_text=v.get("hook", v.get("hook_text", "")),
+                        body_text=v.get("body", v.get("body_text", "")),
+                        cta_text=v.get("cta", v.get("cta_text", "")),
+                        base_image=base_image.copy() if base_image is not None else None,
+                        **kwargs,
+                    )
+                except Exception as e:
+                    result = {"success": False, "error": f"Composition failed: {str(e)}"}
+            return index, result
+
+        return [asyncio.create_task(_one(i, v)) for i, v in enumerate(variations)]
+
+
+@lru_cache
+def get_image_compositor() -> ImageCompositor:
+    """Get the shared compositor instance (font and emoji caches live across requests)."""
+    return ImageCompositor()
@@ -0,0 +1,31 @@
+"""Cover-fit (resize and center-crop) shared by the compositors."""
+
+from PIL import Image
+
+
+def fit_to_size(img: Image.Image, size: tuple[int, int]) -> Image.Image:
+    """
+    Scale img to cover size and center-crop the overflow, in one resample.
+
+    Only the centered box that survives the crop is resampled, so the
+    discarded margins are never touched. reducing_gap lets Pillow
+    box-reduce that region by an integer factor first when the source is
+    over 4x the target, leaving LANCZOS at least 2x of downscaling to do.
+    """
+    width, height = img.size
+    target_width, target_height = size
+    target_ratio = target_width / target_height
+
+    if width / height > target_ratio:
+        crop_width, crop_height = height * target_ratio, height
+    else:
+        crop_width, crop_height = width, width / target_ratio
+    left = (width - crop_width) / 2
+    top = (height - crop_height) / 2
+
+    return img.resize(
+        size,
+        Image.Resampling.LANCZOS,
+        box=(left, top, left + crop_width, top + crop_height),
+        reducing_gap=2.0,
+    )
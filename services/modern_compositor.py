@@ -1,13 +1,17 @@
 """Modern image compositor using pictex for professional text effects."""
 
+import asyncio
 import io
 from dataclasses import dataclass
 from enum import Enum
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Optional, Literal
 from PIL import Image as PILImage, ImageDraw
 
 from pictex import Canvas, Row, Column, Text, Shadow, LinearGradient, Image as PictexImage
 
+from services.image_fit import fit_to_size
 from services.storage import get_storage_service
 
 
@@ -29,7 +33,7 @@ class TextPosition(str, Enum):
     RULE_OF_THIRDS = "rule_of_thirds"  # Classic rule of thirds
 
 
-@dataclass
+@dataclass(slots=True)
 class ColorScheme:
     """Color scheme for a design preset."""
     background: str | list[str]  # Solid color or gradient colors
@@ -41,7 +45,7 @@ class ColorScheme:
     stroke_color: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class SafeZone:
     """Safe zone margins for a format (in pixels)."""
     top: int
@@ -115,6 +119,9 @@ SAFE_ZONES = {
     "youtube_thumbnail": SafeZone(top=40, bottom=40, left=60, right=60),
 }
 
+# Fallback for output sizes without a profile, built once instead of per lookup
+_DEFAULT_SAFE_ZONE = SafeZone(top=60, bottom=60, left=60, right=60)
+
 # Available fonts with Cyrillic support (Google Fonts names)
 # These need to be installed on the system or downloaded
 FONTS = {
@@ -275,6 +282,15 @@ FONT_SIZE_RATIOS = {
 class ModernCompositor:
     """Creates professional ad creatives with modern text effects using pictex."""
 
+    # Same trade-off as ImageCompositor: fast zlib level, slightly larger PNGs
+    PNG_COMPRESS_LEVEL = 1
+
+    # output_format -> (Pillow format, save kwargs); WebP is ~30% smaller
+    OUTPUT_FORMATS = MappingProxyType({
+        "png": ("PNG", {"compress_level": PNG_COMPRESS_LEVEL}),
+        "webp": ("WEBP", {"quality": 85, "method": 4}),
+    })
+
     def __init__(self, font_path: Optional[str] = None):
         """Initialize compositor with optional custom font."""
         self.font_path = font_path
@@ -338,7 +354,7 @@ class ModernCompositor:
         """
         Get safe content area (x, y, width, height) within safe zones.
         """
-        safe_zone = SAFE_ZONES.get(output_size, SafeZone(60, 60, 60, 60))
+        safe_zone = SAFE_ZONES.get(output_size, _DEFAULT_SAFE_ZONE)
 
         content_x = safe_zone.left
         content_y = safe_zone.top
@@ -448,6 +464,7 @@ class ModernCompositor:
         custom_colors: Optional[ColorScheme] = None,
         font_name: str = "inter",
         text_position: TextPosition = TextPosition.CENTER,
+        output_format: str = "png",
     ) -> bytes:
         """
         Compose an ad creative with modern text effects.
@@ -462,9 +479,10 @@ class ModernCompositor:
             custom_colors: Optional custom color scheme
             font_name: Font to use (from FONTS dict)
             text_position: Text positioning preset
+            output_format: Encoding, a key of OUTPUT_FORMATS
 
         Returns:
-            PNG image bytes
+            Image bytes in output_format
         """
         width, height = SIZES.get(output_size, (1080, 1080))
         scheme = custom_colors or PRESET_SCHEMES[preset]
@@ -478,10 +496,11 @@ class ModernCompositor:
         cta = self._create_cta(cta_text, scheme, font_sizes["cta"])
 
         # Calculate gaps based on content height
+        _, _, _, content_height = self._get_safe_content_area(width, height, output_size)
         gap = max(25, int(content_height * 0.035))
 
         # Get safe zone for this format
-        safe_zone = SAFE_ZONES.get(output_size, SafeZone(60, 60, 60, 60))
+        safe_zone = SAFE_ZONES.get(output_size, _DEFAULT_SAFE_ZONE)
 
         # Determine vertical positioning based on text_position
         if text_position == TextPosition.TOP_HEAVY:
@@ -525,10 +544,7 @@ class ModernCompositor:
         # Render
         image = canvas.render(positioned_content)
 
-        # Convert to bytes
-        buffer = io.BytesIO()
-        image.to_pillow().save(buffer, format="PNG")
-        return buffer.getvalue()
+        return self._encode(image.to_pillow(), output_format)
 
     async def compose_and_upload(
         self,
@@ -542,7 +558,8 @@ class ModernCompositor:
         text_position: TextPosition = TextPosition.CENTER,
     ) -> str:
         """Compose ad and upload to storage, returning URL."""
-        image_bytes = self.compose(
+        image_bytes = await asyncio.to_thread(
+            self.compose,
             hook_text=hook_text,
             body_text=body_text,
             cta_text=cta_text,
@@ -568,6 +585,7 @@ class ModernCompositor:
         use_floor_fade: bool = True,
         font_name: str = "inter",
         text_position: TextPosition = TextPosition.CENTER,
+        output_format: str = "png",
     ) -> bytes:
         """
         Compose ad with background image and darkening overlay.
@@ -580,6 +598,7 @@ class ModernCompositor:
             use_floor_fade: Apply gradient fade toward bottom
             font_name: Font to use
             text_position: Text positioning preset
+            output_format: Encoding, a key of OUTPUT_FORMATS
         """
         width, height = SIZES.get(output_size, (1080, 1080))
         scheme = PRESET_SCHEMES[preset]
@@ -638,10 +657,11 @@ class ModernCompositor:
         )
 
         # Calculate gaps and positioning
+        _, _, _, content_height = self._get_safe_content_area(width, height, output_size)
         gap = max(25, int(content_height * 0.035))
 
         # Get safe zone for this format
-        safe_zone = SAFE_ZONES.get(output_size, SafeZone(60, 60, 60, 60))
+        safe_zone = SAFE_ZONES.get(output_size, _DEFAULT_SAFE_ZONE)
 
         if text_position == TextPosition.TOP_HEAVY:
             justify = "start"
@@ -681,10 +701,14 @@ class ModernCompositor:
         # Composite text over background
         final = PILImage.alpha_composite(bg_image, text_pil)
 
-        # Convert to bytes
-        output_buffer = io.BytesIO()
-        final.save(output_buffer, format="PNG")
-        return output_buffer.getvalue()
+        return self._encode(final, output_format)
+
+    def _encode(self, image: PILImage.Image, output_format: str) -> bytes:
+        """Encode the rendered image once, straight to output_format."""
+        pil_format, save_kwargs = self.OUTPUT_FORMATS[output_format]
+        buffer = io.BytesIO()
+        image.save(buffer, format=pil_format, **save_kwargs)
+        return buffer.getvalue()
 
     def _resize_and_crop(
         self,
@@ -693,26 +717,13 @@ class ModernCompositor:
         target_height: int,
     ) -> PILImage.Image:
         """Resize and center-crop image to target dimensions."""
-        img_width, img_height = image.size
-        target_ratio = target_width / target_height
-        img_ratio = img_width / img_height
-
-        if img_ratio > target_ratio:
-            new_height = target_height
-            new_width = int(img_width * (target_height / img_height))
-        else:
-            new_width = target_width
-            new_height = int(img_height * (target_width / img_width))
-
-        image = image.resize((new_width, new_height), PILImage.Resampling.LANCZOS)
+        return fit_to_size(image, (target_width, target_height))
 
-        # Center crop
-        left = (new_width - target_width) // 2
-        top = (new_height - target_height) // 2
-        right = left + target_width
-        bottom = top + target_height
 
-        return image.crop((left, top, right, bottom))
+@lru_cache
+def get_modern_compositor() -> ModernCompositor:
+    """Get the shared compositor instance using the default font."""
+    return ModernCompositor()
 
 
 # Convenience function
@@ -725,7 +736,7 @@ def create_modern_ad(
     font: str = "inter",
 ) -> bytes:
     """Quick function to create a modern ad creative."""
-    compositor = ModernCompositor()
+    compositor = get_modern_compositor()
     return compositor.compose(
         hook_text=hook,
         body_text=body,
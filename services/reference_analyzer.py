@@ -5,9 +5,12 @@ Extracts technical data like dimensions, format, and dominant colors.
 
 import io
 import base64
-import httpx
+from typing import BinaryIO
+
 from PIL import Image
 
+from services.http_client import get_http_client
+
 class ReferenceAnalyzer:
     """Analyzes reference images for technical properties."""
 
@@ -21,28 +24,34 @@ class ReferenceAnalyzer:
         image_base64: str | None = None,
         analysis_type: str = "technical", # Default to technical
         context: str | None = None,       # Ignored
+        image_file: BinaryIO | None = None,
     ) -> dict:
         """
         Analyze a reference image for technical properties.
 
+        image_file is a binary file object (e.g. an upload's spooled temp
+        file); Pillow reads it directly with no base64 round-trip.
+
         Returns:
             Dict with width, height, format, mode, dominant_colors
         """
-        if not image_url and not image_base64:
+        if not image_url and not image_base64 and image_file is None:
             return {
                 "success": False,
-                "error": "Either image_url or image_base64 must be provided",
+                "error": "One of image_url, image_base64 or an uploaded image must be provided",
             }
 
         try:
             # 1. Load Image
             img = None
             if image_url:
-                async with httpx.AsyncClient() as client:
-                    response = await client.get(str(image_url))
-                    response.raise_for_status()
-                    image_data = response.content
-                    img = Image.open(io.BytesIO(image_data))
+                client = get_http_client()
+                response = await client.get(str(image_url))
+                response.raise_for_status()
+                image_data = response.content
+                img = Image.open(io.BytesIO(image_data))
+            elif image_file is not None:
+                img = Image.open(image_file)
             else:
                 # Handle base64
                 if "base64," in image_base64:
@@ -6,10 +6,9 @@ from abc import ABC, abstractmethod
 from datetime import datetime
 from functools import lru_cache
 from pathlib import Path
+from typing import BinaryIO
 
 import aiofiles
-import boto3
-from botocore.exceptions import ClientError
 
 from config import get_settings
 
@@ -20,7 +19,7 @@ class StorageService(ABC):
     @abstractmethod
     async def save(
         self,
-        data: bytes,
+        data: bytes | BinaryIO,
         filename: str | None = None,
         content_type: str = "image/png",
         folder: str = "",
@@ -29,7 +28,7 @@ class StorageService(ABC):
         Save data to storage.
 
         Args:
-            data: Binary data to save
+            data: Binary data to save, or a readable binary file positioned at its start
             filename: Optional filename (generated if not provided)
             content_type: MIME type of the content
             folder: Optional subfolder
@@ -69,7 +68,7 @@ class LocalStorageService(StorageService):
 
     async def save(
         self,
-        data: bytes,
+        data: bytes | BinaryIO,
         filename: str | None = None,
         content_type: str = "image/png",
         folder: str = "",
@@ -99,7 +98,12 @@ class LocalStorageService(StorageService):
         # Save the file
         file_path = save_path / filename
         async with aiofiles.open(file_path, "wb") as f:
-            await f.write(data)
+            if isinstance(data, (bytes, bytearray)):
+                await f.write(data)
+            else:
+                # Copy file-like data in chunks rather than reading it whole
+                while chunk := data.read(64 * 1024):
+                    await f.write(chunk)
 
         # Generate URL
         url_path = f"/files/{folder}/{filename}" if folder else f"/files/{filename}"
@@ -145,11 +149,13 @@ class S3StorageService(StorageService):
         if settings.s3_endpoint_url:
             client_kwargs["endpoint_url"] = settings.s3_endpoint_url
 
+        import boto3  # only S3 deployments pay for the (slow) boto3 import
+
         self.client = boto3.client("s3", **client_kwargs)
 
     async def save(
         self,
-        data: bytes,
+        data: bytes | BinaryIO,
         filename: str | None = None,
         content_type: str = "image/png",
         folder: str = "",
@@ -191,6 +197,8 @@ class S3StorageService(StorageService):
         """Delete a file from S3."""
         key = f"{folder}/{filename}" if folder else filename
 
+        from botocore.exceptions import ClientError
+
         try:
             self.client.delete_object(Bucket=self.bucket, Key=key)
             return True
@@ -1,8 +1,11 @@
 """Web search service for finding reference images."""
 
-import httpx
+from functools import lru_cache
+
+import orjson
 
 from config import get_settings
+from services.http_client import get_http_client
 
 
 class WebSearchService:
@@ -13,6 +16,11 @@ class WebSearchService:
     def __init__(self):
         settings = get_settings()
         self.api_key = settings.serper_api_key
+        # Built once; every search sends the same headers
+        self._headers = {
+            "X-API-KEY": self.api_key,
+            "Content-Type": "application/json",
+        }
 
     async def search_images(
         self,
@@ -47,44 +55,41 @@ class WebSearchService:
             if image_type:
                 payload["type"] = image_type
 
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.SERPER_API_URL,
-                    headers={
-                        "X-API-KEY": self.api_key,
-                        "Content-Type": "application/json",
-                    },
-                    json=payload,
-                    timeout=30.0,
-                )
-
-                if response.status_code != 200:
-                    return {
-                        "success": False,
-                        "error": f"Serper API error: {response.status_code}",
-                        "results": [],
-                    }
-
-                data = response.json()
-                images = data.get("images", [])
-
-                results = []
-                for img in images[:num_results]:
-                    results.append(
-                        {
-                            "title": img.get("title", ""),
-                            "url": img.get("link", ""),
-                            "image_url": img.get("imageUrl", ""),
-                            "thumbnail_url": img.get("thumbnailUrl", ""),
-                            "source": img.get("source", ""),
-                        }
-                    )
+            client = get_http_client()
+            response = await client.post(
+                self.SERPER_API_URL,
+                headers=self._headers,
+                content=orjson.dumps(payload),
+                timeout=30.0,
+            )
 
+            if response.status_code != 200:
                 return {
-                    "success": True,
-                    "results": results,
+                    "success": False,
+                    "error": f"Serper API error: {response.status_code}",
+                    "results": [],
                 }
 
+            data = orjson.loads(response.content)
+            images = data.get("images", [])
+
+            results = []
+            for img in images[:num_results]:
+                results.append(
+                    {
+                        "title": img.get("title", ""),
+                        "url": img.get("link", ""),
+                        "image_url": img.get("imageUrl", ""),
+                        "thumbnail_url": img.get("thumbnailUrl", ""),
+                        "source": img.get("source", ""),
+                    }
+                )
+
+            return {
+                "success": True,
+                "results": results,
+            }
+
         except Exception as e:
             return {
                 "success": False,
@@ -115,3 +120,9 @@ class WebSearchService:
             search_query = f"{query} {platform} ad example"
 
         return await self.search_images(search_query, num_results)
+
+
+@lru_cache
+def get_web_search_service() -> WebSearchService:
+    """Get the shared web search service instance."""
+    return WebSearchService()
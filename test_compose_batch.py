@@ -0,0 +1,70 @@
+"""Test compose-batch variation parsing - null and missing text keys."""
+
+import json
+import os
+import tempfile
+
+os.environ.setdefault("STORAGE_LOCAL_PATH", tempfile.mkdtemp(prefix="creo_test_"))
+
+from fastapi.testclient import TestClient
+
+from main import app
+
+client = TestClient(app)
+
+VARIATIONS = [
+    {"hook": "Hook one", "body": None, "cta": None},
+    {"hook": None, "body": "Body only"},
+    {"hook_text": "Hook three"},
+]
+
+
+def post_batch(format_type: str, variations=VARIATIONS, **params) -> dict:
+    response = client.post(
+        "/tools/compose-batch",
+        params={
+            "variations_json": json.dumps(variations),
+            "format_type": format_type,
+            **params,
+        },
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_null_and_missing_text():
+    """Explicit nulls and missing keys compose as empty text."""
+    for format_type in ("text_only", "stickers"):
+        result = post_batch(format_type)
+        assert result["success"], result
+        assert result["count"] == len(VARIATIONS)
+        assert result["creatives"][0]["body"] == ""
+        assert result["creatives"][1]["hook"] == ""
+
+
+def test_null_and_missing_text_streamed():
+    """Streamed batches report every variation for the same input."""
+    response = client.post(
+        "/tools/compose-batch",
+        params={
+            "variations_json": json.dumps(VARIATIONS),
+            "format_type": "text_only",
+            "stream": "true",
+        },
+    )
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(line["index"] for line in lines) == [1, 2, 3]
+    assert all(line["success"] for line in lines), lines
+
+
+def test_invalid_variations():
+    """Malformed variations_json is rejected without composing."""
+    assert not post_batch("text_only", variations={"hook": "x"})["success"]
+    assert not post_batch("text_only", variations=[{"hook": 5}])["success"]
+
+
+if __name__ == "__main__":
+    test_null_and_missing_text()
+    test_null_and_missing_text_streamed()
+    test_invalid_variations()
+    print("✓ compose-batch parsing tests passed")
@@ -0,0 +1,82 @@
+"""Test ImageCompositor.compose_many with specs on mixed backgrounds."""
+
+import asyncio
+import io
+import os
+import tempfile
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+os.environ.setdefault("STORAGE_LOCAL_PATH", tempfile.mkdtemp(prefix="creo_test_"))
+
+from PIL import Image
+
+from services.image_compositor import ImageCompositor
+
+BACKGROUND_COLORS = {"/red.png": "firebrick", "/blue.png": "steelblue"}
+
+
+def serve_backgrounds() -> tuple[ThreadingHTTPServer, str, Counter]:
+    """Serve solid PNG backgrounds on localhost; returns the server, base URL and hit counts."""
+    backgrounds = {}
+    for path, color in BACKGROUND_COLORS.items():
+        buffer = io.BytesIO()
+        Image.new("RGB", (1200, 900), color=color).save(buffer, format="PNG")
+        backgrounds[path] = buffer.getvalue()
+    hits = Counter()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = backgrounds.get(self.path)
+            hits[self.path] += 1
+            if body is None:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "image/png")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}", hits
+
+
+def test_mixed_backgrounds():
+    """Specs on different backgrounds and formats come back in spec order."""
+    server, base_url, hits = serve_backgrounds()
+    specs = [
+        {"format_type": "meme", "image_url": f"{base_url}/red.png", "hook_text": "Red one"},
+        {"format_type": "text_only", "hook_text": "Text only", "cta_text": "Go"},
+        {"format_type": "meme", "image_url": f"{base_url}/blue.png", "hook_text": "Blue one"},
+        {"format_type": "meme", "image_url": f"{base_url}/red.png", "hook_text": "Red two"},
+        {"format_type": "split", "image_url": f"{base_url}/blue.png", "hook_text": "Split"},
+        {"format_type": "meme", "image_url": f"{base_url}/missing.png", "hook_text": "Missing"},
+    ]
+    try:
+        results = asyncio.run(ImageCompositor().compose_many(specs, concurrency=2))
+    finally:
+        server.shutdown()
+
+    assert len(results) == len(specs)
+    assert [r["success"] for r in results] == [True, True, True, True, True, False], results
+    assert results[5]["error"].startswith("Failed to load image")
+    # Both red specs share one batch, so red.png is fetched once
+    assert hits["/red.png"] == 1, hits
+
+    # Each result is the composition of its own spec, not a neighbour's
+    storage_path = os.environ["STORAGE_LOCAL_PATH"]
+    for result, color in ((results[0], "firebrick"), (results[2], "steelblue")):
+        path = os.path.join(storage_path, "composed", result["filename"])
+        with Image.open(path) as img:
+            assert img.convert("RGB").getpixel((5, 5)) == Image.new("RGB", (1, 1), color).getpixel((0, 0))
+
+
+if __name__ == "__main__":
+    test_mixed_backgrounds()
+    print("✓ compose_many tests passed")
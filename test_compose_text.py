@@ -0,0 +1,74 @@
+"""Test compose() with missing text on image backgrounds (URL and file)."""
+
+import asyncio
+import io
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+os.environ.setdefault("STORAGE_LOCAL_PATH", tempfile.mkdtemp(prefix="creo_test_"))
+
+from PIL import Image
+
+from services.image_compositor import ImageCompositor
+
+CASES = [
+    {"hook_text": "Hi", "body_text": "Body", "cta_text": None},
+    {"hook_text": None, "body_text": "Body", "cta_text": "Go"},
+    {"hook_text": None, "body_text": None, "cta_text": None},
+]
+
+
+def _background_png() -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (1200, 900), color="steelblue").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def serve_background() -> tuple[ThreadingHTTPServer, str]:
+    """Serve a PNG background on localhost; returns the server and its URL."""
+    png = _background_png()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "image/png")
+            self.send_header("Content-Length", str(len(png)))
+            self.end_headers()
+            self.wfile.write(png)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/bg.png"
+
+
+async def compose_all(sources: list[str]) -> list[dict]:
+    compositor = ImageCompositor()
+    return [
+        await compositor.compose(image_source=source, **case)
+        for source in sources
+        for case in CASES
+    ]
+
+
+def test_none_text_on_image_backgrounds():
+    """A None hook, body or CTA composes as empty text on URL and file backgrounds."""
+    server, url = serve_background()
+    with tempfile.NamedTemporaryFile(suffix=".png") as bg_file:
+        bg_file.write(_background_png())
+        bg_file.flush()
+        try:
+            results = asyncio.run(compose_all([url, bg_file.name, "white"]))
+        finally:
+            server.shutdown()
+    for result in results:
+        assert result["success"], result
+
+
+if __name__ == "__main__":
+    test_none_text_on_image_backgrounds()
+    print("✓ compose missing-text tests passed")
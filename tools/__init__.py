@@ -2,11 +2,13 @@
 
 from tools.image_gen import generate_image
 from tools.reference import analyze_reference, search_references
-from tools.video_gen import generate_video
+from tools.video_gen import generate_video, start_video_job, get_video_job
 
 __all__ = [
     "generate_image",
     "analyze_reference",
     "search_references",
     "generate_video",
+    "start_video_job",
+    "get_video_job",
 ]
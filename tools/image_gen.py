@@ -1,38 +1,48 @@
 """Image generation tool endpoint."""
 
+import asyncio
+from functools import lru_cache
+
 from backends import DallE3Backend, FluxBackend, StabilityBackend, IdeogramBackend
 from backends.base import ImageBackend
 from config import get_settings
 from services.storage import get_storage_service
 
 
+@lru_cache
+def _backend_instance(backend_class: type[ImageBackend]) -> ImageBackend:
+    """One instance per backend class, so API clients and their pools are reused."""
+    return backend_class()
+
+
+# Backend name -> (class, settings attribute holding its API key)
+BACKEND_MAP = {
+    "dalle3": (DallE3Backend, "openai_api_key"),
+    "flux": (FluxBackend, "replicate_api_token"),
+    "sdxl": (FluxBackend, "replicate_api_token"),  # Uses Replicate too
+    "stability": (StabilityBackend, "stability_api_key"),
+    "ideogram": (IdeogramBackend, "ideogram_api_key"),
+}
+
+# Auto-select priority: dalle3 > ideogram > flux > stability
+PRIORITY_ORDER = ("dalle3", "ideogram", "flux", "stability")
+
+
 def get_backend(backend_name: str | None) -> ImageBackend | None:
     """Get the appropriate backend instance."""
     settings = get_settings()
 
-    backend_map = {
-        "dalle3": (DallE3Backend, settings.openai_api_key),
-        "flux": (FluxBackend, settings.replicate_api_token),
-        "sdxl": (FluxBackend, settings.replicate_api_token),  # Uses Replicate too
-        "stability": (StabilityBackend, settings.stability_api_key),
-        "ideogram": (IdeogramBackend, settings.ideogram_api_key),
-    }
-
     if backend_name:
-        backend_info = backend_map.get(backend_name.lower())
-        if backend_info and backend_info[1]:  # Check if API key exists
-            backend_class, _ = backend_info
-            return backend_class()
+        backend_info = BACKEND_MAP.get(backend_name.lower())
+        if backend_info and getattr(settings, backend_info[1]):  # Check if API key exists
+            return _backend_instance(backend_info[0])
         return None
 
     # Auto-select best available backend
-    # Priority: dalle3 > ideogram > flux > stability
-    priority_order = ["dalle3", "ideogram", "flux", "stability"]
-    for name in priority_order:
-        backend_info = backend_map.get(name)
-        if backend_info and backend_info[1]:
-            backend_class, _ = backend_info
-            return backend_class()
+    for name in PRIORITY_ORDER:
+        backend_class, key_attr = BACKEND_MAP[name]
+        if getattr(settings, key_attr):
+            return _backend_instance(backend_class)
 
     return None
 
@@ -75,11 +85,8 @@ async def generate_image(
         }
 
     storage = get_storage_service()
-    images = []
-    errors = []
 
-    # Generate requested number of images
-    for i in range(num_images):
+    async def _generate_one() -> tuple[dict | None, str | None]:
         result = await image_backend.generate(
             prompt=prompt,
             size=size,
@@ -88,24 +95,31 @@ async def generate_image(
             negative_prompt=negative_prompt,
         )
 
-        if result.success and result.image_data:
-            # Save the image
+        if not (result.success and result.image_data):
+            return None, result.error or "Unknown error"
+
+        # Save the image
+        try:
             filename, url = await storage.save(
                 data=result.image_data,
                 content_type="image/png",
                 folder="generated",
             )
+        finally:
+            # Backends may hand over a spooled download; release it once stored
+            if hasattr(result.image_data, "close"):
+                result.image_data.close()
+        return {
+            "url": url,
+            "filename": filename,
+            "backend": image_backend.name,
+            "revised_prompt": result.revised_prompt,
+        }, None
 
-            images.append(
-                {
-                    "url": url,
-                    "filename": filename,
-                    "backend": image_backend.name,
-                    "revised_prompt": result.revised_prompt,
-                }
-            )
-        else:
-            errors.append(result.error or "Unknown error")
+    # Generate requested number of images concurrently
+    outcomes = await asyncio.gather(*(_generate_one() for _ in range(num_images)))
+    images = [image for image, _ in outcomes if image is not None]
+    errors = [error for _, error in outcomes if error is not None]
 
     # Build response
     success = len(images) > 0
@@ -158,25 +172,29 @@ async def compare_backends(
             "error": "No backends available for comparison",
         }
 
-    comparisons = []
-
-    for backend_name in backends_to_use:
-        result = await generate_image(
-            prompt=prompt,
-            backend=backend_name,
-            size=size,
-            quality=quality,
-            num_images=1,
-        )
-
-        comparisons.append(
-            {
-                "backend": backend_name,
-                "success": result["success"],
-                "image": result["images"][0] if result["images"] else None,
-                "error": result.get("error"),
-            }
+    # Query every backend at once; total time is the slowest backend, not the sum
+    results = await asyncio.gather(
+        *(
+            generate_image(
+                prompt=prompt,
+                backend=backend_name,
+                size=size,
+                quality=quality,
+                num_images=1,
+            )
+            for backend_name in backends_to_use
         )
+    )
+
+    comparisons = [
+        {
+            "backend": backend_name,
+            "success": result["success"],
+            "image": result["images"][0] if result["images"] else None,
+            "error": result.get("error"),
+        }
+        for backend_name, result in zip(backends_to_use, results)
+    ]
 
     return {
         "success": any(c["success"] for c in comparisons),
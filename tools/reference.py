@@ -1,7 +1,9 @@
 """Reference image analysis and search tools."""
 
+from typing import BinaryIO
+
 from services.reference_analyzer import ReferenceAnalyzer
-from services.web_search import WebSearchService
+from services.web_search import get_web_search_service
 
 
 async def analyze_reference(
@@ -9,6 +11,7 @@ async def analyze_reference(
     image_base64: str | None = None,
     analysis_type: str = "full",
     context: str | None = None,
+    image_file: BinaryIO | None = None,
 ) -> dict:
     """
     Analyze a reference image to extract style, colors, composition, etc.
@@ -18,14 +21,15 @@ async def analyze_reference(
         image_base64: Base64-encoded image data (alternative to URL)
         analysis_type: Type of analysis (full, style, colors, composition, text)
         context: Additional context to focus the analysis
+        image_file: Binary file object with the image (e.g. a multipart upload)
 
     Returns:
         Dict with analysis results
     """
-    if not image_url and not image_base64:
+    if not image_url and not image_base64 and image_file is None:
         return {
             "success": False,
-            "error": "Either image_url or image_base64 must be provided",
+            "error": "One of image_url, image_base64 or an uploaded image must be provided",
         }
 
     analyzer = ReferenceAnalyzer()
@@ -34,6 +38,7 @@ async def analyze_reference(
         image_base64=image_base64,
         analysis_type=analysis_type,
         context=context,
+        image_file=image_file,
     )
 
     # Transform to match API schema
@@ -73,7 +78,7 @@ async def search_references(
     Returns:
         Dict with search results
     """
-    search_service = WebSearchService()
+    search_service = get_web_search_service()
 
     if platform:
         # Use ad-specific search
@@ -89,20 +94,11 @@ async def search_references(
             image_type=image_type,
         )
 
-    # Transform to match API schema
+    # WebSearchService already emits results in the SearchResult shape
     if result.get("success"):
         return {
             "success": True,
-            "results": [
-                {
-                    "title": r.get("title", ""),
-                    "url": r.get("url", ""),
-                    "image_url": r.get("image_url"),
-                    "thumbnail_url": r.get("thumbnail_url"),
-                    "source": r.get("source"),
-                }
-                for r in result.get("results", [])
-            ],
+            "results": result.get("results", []),
         }
     else:
         return {
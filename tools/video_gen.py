@@ -1,7 +1,18 @@
 """Video generation tool (Phase 4 - placeholder implementation)."""
 
+import asyncio
+import uuid
+from collections import OrderedDict
+
 from config import get_settings
 
+# Background video jobs: task_id -> {"status", "result", "task"}.
+# Video renders take minutes, so callers poll instead of holding a request open.
+# Oldest finished jobs are dropped once MAX_VIDEO_JOBS is exceeded.
+# Jobs live in this process only, so polling needs a single-worker server.
+MAX_VIDEO_JOBS = 256
+_video_jobs: OrderedDict[str, dict] = OrderedDict()
+
 
 async def generate_video(
     prompt: str,
@@ -124,3 +135,45 @@ async def _generate_kling(
         "duration": None,
         "backend": "kling",
     }
+
+
+def start_video_job(**kwargs) -> str:
+    """
+    Start generate_video in the background and return its task id.
+
+    Takes the same keyword arguments as generate_video. Poll the result
+    with get_video_job(). Jobs live in this process only, so they are lost
+    on restart.
+    """
+    task_id = uuid.uuid4().hex
+    job = {"status": "pending", "result": None, "task": None}
+
+    async def _run():
+        job["status"] = "running"
+        try:
+            job["result"] = await generate_video(**kwargs)
+            job["status"] = "done"
+        except Exception as e:
+            job["result"] = {"success": False, "error": str(e)}
+            job["status"] = "failed"
+
+    job["task"] = asyncio.create_task(_run())
+    _video_jobs[task_id] = job
+
+    # Evict the oldest finished jobs beyond the cap; running ones are kept
+    if len(_video_jobs) > MAX_VIDEO_JOBS:
+        for old_id in list(_video_jobs):
+            if len(_video_jobs) <= MAX_VIDEO_JOBS:
+                break
+            if _video_jobs[old_id]["status"] in ("done", "failed"):
+                del _video_jobs[old_id]
+
+    return task_id
+
+
+def get_video_job(task_id: str) -> dict | None:
+    """Get {"status", "result"} for a background video job, or None if unknown."""
+    job = _video_jobs.get(task_id)
+    if job is None:
+        return None
+    return {"status": job["status"], "result": job["result"]}